@@ -2,6 +2,7 @@
 """
 
 from code.graph2 import Graph
+from code.csr_graph import CSRGraph
 from code.graph_coloring import SpectrumGraphColoring
 from code.dsatur import DSATURGraphColoring
 from code.randomc import RandomGraphColoring
@@ -13,35 +14,26 @@ from code.swo import SWOGraphColoring
 from code.improved_methods import DSATURPlusSS, VMPlusSS, \
     BFSPlusSS, DBFSPlusSS, SWOPlusSS
 from code.dimacs import dimacs_reader
-from code.weight_functions import inv_pow2, empiric_dist
+from code.generators import gnp_random_graph, geometric_graph
+from code.weight_functions import inv_pow2, empiric_dist, interference_matrix
+from code.banded_w import BandedW
+from code.result_cache import ResultCache
+from code.spectrum_frontier import SpectrumFrontier
 
 
-def random_graph(n, p):
+def random_graph(n, p, seed=None):
     """Crea un grafo aleatorio de 'n' vertices con una probabilidad
     de conexion 'p'.
 
     Args:
         n (int): Cantidad de vertices del grafo.
         p (float): Probabilidad de que dos vertices del grafo esten conectados.
+        seed (int, opcional): Semilla del generador aleatorio. Por defecto es None.
 
     Returns:
-        Graph: Nuevo grafo.
+        CSRGraph: Nuevo grafo.
     """        
-    import random
-    import numpy as np
-    graph = np.zeros((n+1, n+1))
-    for i in range(1, n+1):
-        for j in range(i+1, n+1):
-            if random.random() <= p:
-                graph[i,j] = graph[j, i] = 1
-    graph_dict = {}
-    for i in range(1, n+1):
-        neighbours_i = []
-        for j in range(1, n+1):
-            if graph[i,j]:
-                neighbours_i.append(str(j))
-        graph_dict[str(i)] = neighbours_i
-    return Graph(graph_dict)
+    return gnp_random_graph(n, p, seed)
 
 def make_spectrum(s_size):
         """Crear un espectro de colores desde 1 hasta 's_size'.
@@ -64,8 +56,22 @@ def make_w(spectrum, w_function):
         Returns:
             Matriz de interferencias.
         """        
-        new_w = {item:{} for item in spectrum}
-        for i, c1 in enumerate(spectrum):
-            for j, c2 in enumerate(spectrum):
-                new_w[c1][c2] = new_w[c2][c1] = w_function(i, j)
-        return new_w
\ No newline at end of file
+        # la matriz se calcula de una vez con 'interference_matrix'
+        w = interference_matrix(w_function, len(spectrum))
+        return {c1:dict(zip(spectrum, row)) for c1, row in zip(spectrum, w.tolist())}
+
+def make_banded_w(spectrum, w_function, tolerance=0.0):
+        """Crea una matriz de interferencias de banda para el espectro usando la
+        funcion 'w_function', que solo debe depender de la distancia entre los colores.
+        Solo se evalua la funcion una vez por distancia y solo se guardan los valores
+        dentro de la banda.
+        Args:
+            spectrum (list): Espectro de colores.
+            w_function : Funcion de interferencia entre los colores.
+            tolerance (float): Las interferencias menores o iguales que 'tolerance' veces
+                la interferencia de un color consigo mismo se toman como 0. Por defecto es 0.0.
+
+        Returns:
+            BandedW: Matriz de interferencias.
+        """
+        return BandedW.from_function(spectrum, w_function, tolerance)
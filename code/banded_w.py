@@ -0,0 +1,144 @@
+""" Python Class
+    Matriz de interferencias de banda (de Toeplitz simetrica), donde la
+    interferencia entre dos colores solo depende de la distancia entre
+    sus posiciones en el espectro y es cero a partir de cierta distancia.
+    Solo se guarda el perfil de la diagonal, es decir, la interferencia
+    para cada distancia hasta el ancho de banda, por lo que la memoria no
+    depende de la cantidad de colores del espectro.
+
+    Admite el mismo acceso por indices que un arreglo de NumPy de |S| x |S|
+    que usan los metodos de coloracion (w[i, j], w[i], w[:k, :k], ...), y
+    las operaciones que dependen de la banda (filas, productos) solo
+    recorren los colores dentro de ella.
+"""
+
+import numpy as np
+
+
+class BandedW(object):
+
+    def __init__(self, size, profile):
+        """Inicializa un objeto BandedW.
+
+        Args:
+            size (int): Cantidad de colores del espectro.
+            profile (list): Interferencia entre dos colores a distancia d en la
+                posicion d. Las distancias posteriores tienen interferencia 0.
+        """
+        profile = np.asarray(profile, dtype=np.float64)
+        nonzero = np.flatnonzero(profile)
+        # el ancho de banda es la mayor distancia con interferencia no nula
+        bandwidth = int(nonzero[-1]) if nonzero.shape[0] else 0
+        self._size = size
+        self._bandwidth = min(bandwidth, max(size - 1, 0))
+        # el perfil termina con un 0 para las distancias fuera de la banda
+        self._profile = np.append(profile[:self._bandwidth + 1], 0.0)
+
+    @classmethod
+    def from_function(cls, spectrum, w_function, tolerance=0.0):
+        """Crea la matriz evaluando la funcion de peso una vez por distancia.
+
+        Args:
+            spectrum (list): Espectro de colores.
+            w_function : Funcion de interferencia entre los colores, que solo
+                debe depender de la distancia entre ellos.
+            tolerance (float): Las interferencias menores o iguales que 'tolerance'
+                veces la interferencia de un color consigo mismo se toman como 0.
+                Por defecto es 0.0, que no cambia ningun valor.
+
+        Returns:
+            BandedW: Nueva matriz.
+        """
+        size = len(spectrum)
+        profile = np.array([w_function(0, d) for d in range(size)], dtype=np.float64)
+        if size and tolerance > 0:
+            profile[np.abs(profile) <= tolerance*abs(profile[0])] = 0
+        return cls(size, profile)
+
+    @property
+    def shape(self):
+        return (self._size, self._size)
+
+    @property
+    def bandwidth(self):
+        return self._bandwidth
+
+    @property
+    def profile(self):
+        """Interferencia para cada distancia hasta el ancho de banda."""
+        return self._profile[:-1]
+
+    def _values(self, rows, cols):
+        """Interferencias entre los colores de 'rows' y 'cols', que se combinan
+        con las reglas de broadcasting de NumPy."""
+        distance = np.abs(np.subtract(rows, cols))
+        return self._profile[np.minimum(distance, self._bandwidth + 1)]
+
+    def __getitem__(self, key):
+        """Acceso por indices como en un arreglo de NumPy de |S| x |S|. Los
+        indices pueden ser enteros, arreglos de enteros o rangos; dos rangos,
+        o un rango y un arreglo, devuelven el bloque correspondiente."""
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        rows, cols = key
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            if isinstance(rows, slice):
+                rows = np.arange(self._size)[rows]
+            if isinstance(cols, slice):
+                cols = np.arange(self._size)[cols]
+            rows = np.asarray(rows)
+            return self._values(rows.reshape(rows.shape + (1,)*np.ndim(cols)), cols)
+        values = self._values(rows, cols)
+        if np.ndim(values) == 0:
+            return float(values)
+        return values
+
+    def band(self, color):
+        """Rango de colores con interferencia no nula con 'color'.
+
+        Args:
+            color (int): Indice del color.
+
+        Returns:
+            int, int, array: Inicio y fin del rango, y las interferencias en el.
+        """
+        lo = max(0, color - self._bandwidth)
+        hi = min(self._size, color + self._bandwidth + 1)
+        return lo, hi, self._values(color, np.arange(lo, hi))
+
+    def diagonal(self):
+        return np.full(self._size, self._profile[0])
+
+    def row_sums(self):
+        """Suma de cada fila de la matriz.
+
+        Returns:
+            array: Suma de cada fila.
+        """
+        sums = np.full(self._size, self._profile[0])
+        positions = np.arange(self._size)
+        for d in range(1, self._bandwidth + 1):
+            # cada fila tiene un vecino a distancia d a cada lado si existe
+            sums += self._profile[d]*((positions >= d).astype(np.float64) + (positions < self._size - d))
+        return sums
+
+    def apply(self, counts):
+        """Producto de una tabla por la matriz, counts @ W, recorriendo solo
+        las diagonales dentro de la banda.
+
+        Args:
+            counts (array): Tabla de m x |S|.
+
+        Returns:
+            array: Tabla de m x |S|.
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        result = counts*self._profile[0]
+        for d in range(1, self._bandwidth + 1):
+            result[:, d:] += counts[:, :-d]*self._profile[d]
+            result[:, :-d] += counts[:, d:]*self._profile[d]
+        return result
+
+    def __array__(self, dtype=None):
+        dense = self[:, :]
+        return dense if dtype is None else dense.astype(dtype)
@@ -0,0 +1,161 @@
+""" Python Class
+    Clase de Python que guarda el estado de una coloracion parcial como
+    la cantidad de vecinos de cada vertice con cada color, en un arreglo
+    de enteros pequeños, junto con el color de cada vertice y el conjunto
+    de vertices de cada color. La potencial interferencia de un vertice
+    con un color no se guarda, sino que se calcula a partir de los conteos
+    y de la matriz W solo cuando se necesita. Asi, colorear o recolorear
+    un vertice es una actualizacion exacta de O(deg) enteros que no
+    acumula errores de redondeo.
+
+    Las columnas de los conteos solo cubren los colores usados hasta el
+    momento, y se extienden a medida que se usan colores mayores. Los
+    arreglos se reutilizan al comenzar una nueva coloracion.
+"""
+
+import numpy as np
+
+
+class ColorCounts(object):
+
+    def __init__(self, graph, s_size, width=1):
+        """Inicializa un objeto ColorCounts sin vertices coloreados.
+
+        Args:
+            graph (CSRGraph): Grafo en formato CSR.
+            s_size (int): Cantidad de colores del espectro.
+            width (int): Cantidad inicial de colores de la tabla de conteos.
+                Por defecto es 1.
+        """
+        self._graph = graph
+        self._s_size = s_size
+        n = graph.n_vertices()
+        # el conteo de un color no supera el grado del vertice
+        max_degree = int(np.diff(graph.offsets).max()) if n else 0
+        dtype = np.uint16 if max_degree <= np.iinfo(np.uint16).max else np.uint32
+        self._counts = np.zeros((n, max(1, min(width, s_size))), dtype=dtype)
+        # indice del color de cada vertice, -1 si aun no se colorea
+        self._colors = np.full(n, -1, dtype=np.intp)
+        # vertices de cada color usado
+        self._members = {}
+        # mayor indice de color usado mas uno
+        self._n_colors = 0
+
+    @property
+    def counts(self):
+        """Tabla de conteos de |V| x m, con m al menos 'n_colors'. No debe modificarse."""
+        return self._counts
+
+    @property
+    def colors(self):
+        """Indice del color de cada vertice, no debe modificarse."""
+        return self._colors
+
+    @property
+    def n_colors(self):
+        """Mayor indice de color usado hasta el momento mas uno."""
+        return self._n_colors
+
+    def members(self, color):
+        """Vertices que tienen el color dado.
+
+        Args:
+            color (int): Indice del color.
+
+        Returns:
+            set: Indices de los vertices, no debe modificarse.
+        """
+        return self._members.get(color, set())
+
+    def reset(self):
+        """Deja todos los vertices sin color, reutilizando los arreglos. Solo
+        se ponen en cero las columnas de los colores usados, ya que las demas
+        no han cambiado.
+        """
+        self._counts[:, :self._n_colors] = 0
+        self._colors.fill(-1)
+        self._members.clear()
+        self._n_colors = 0
+
+    def _ensure(self, color):
+        """Extiende la tabla de conteos para que incluya el color dado. La
+        tabla al menos duplica su ancho para que las extensiones sean pocas.
+
+        Args:
+            color (int): Indice del color.
+        """
+        width = self._counts.shape[1]
+        if color < width:
+            return
+        table = np.zeros((self._counts.shape[0], min(self._s_size, max(color + 1, 2*width))),
+            dtype=self._counts.dtype)
+        table[:, :width] = self._counts
+        self._counts = table
+
+    def assign(self, i, color):
+        """Asigna un color al vertice con indice 'i', quitandole antes su
+        color previo si lo tenia, y actualiza los conteos de sus vecinos.
+
+        Args:
+            i (int): Indice del vertice.
+            color (int): Indice del color.
+        """
+        if self._colors[i] == color:
+            return
+        if self._colors[i] >= 0:
+            self.unassign(i)
+        self._ensure(color)
+        np.add.at(self._counts, (self._graph.neighbour_indices(i), color), 1)
+        self._colors[i] = color
+        self._members.setdefault(color, set()).add(i)
+        self._n_colors = max(self._n_colors, color + 1)
+
+    def unassign(self, i):
+        """Quita el color del vertice con indice 'i' y actualiza los conteos
+        de sus vecinos.
+
+        Args:
+            i (int): Indice del vertice.
+        """
+        color = self._colors[i]
+        if color < 0:
+            return
+        np.subtract.at(self._counts, (self._graph.neighbour_indices(i), color), 1)
+        self._colors[i] = -1
+        self._members[color].discard(i)
+        # si se vacian los mayores colores, el estado queda igual que si
+        # nunca se hubieran usado
+        while self._n_colors and not self._members.get(self._n_colors - 1):
+            self._n_colors -= 1
+
+    def potential(self, i, w, m):
+        """Potencial interferencia del vertice con indice 'i' con los
+        primeros 'm' colores, calculada como el producto de sus conteos
+        por las filas de W de los colores usados por sus vecinos.
+
+        Args:
+            i (int): Indice del vertice.
+            w (array): Matriz de |S| x |S| de interferencias entre los colores.
+            m (int): Cantidad de colores.
+
+        Returns:
+            array: Potencial interferencia con cada uno de los 'm' colores.
+        """
+        row = self._counts[i]
+        used = np.flatnonzero(row)
+        return row[used] @ w[used, :m]
+
+    def potential_at(self, i, w, color):
+        """Potencial interferencia del vertice con indice 'i' con un color.
+
+        Args:
+            i (int): Indice del vertice.
+            w (array): Matriz de |S| x |S| de interferencias entre los colores.
+            color (int): Indice del color.
+
+        Returns:
+            float: Potencial interferencia.
+        """
+        row = self._counts[i]
+        used = np.flatnonzero(row)
+        return float(row[used] @ w[used, color])
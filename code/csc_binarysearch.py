@@ -1,22 +1,61 @@
 """ Python Class
     Clase que da solucion a CSC hallando el menor k que
-    cumpla con el t fijado en el problema. Este k se encuentra
-    mediante una Busqueda Binaria desde 1 hasta |V|, tomando el
-    menor valor que satisfaga el umbral t. Para saber si
+    cumpla con el t fijado en el problema. Para saber si
     con un determinado k se puede satisfacer un umbral t, usaremos
-    algun metodo de TSC. Dicho metodo no estara implementado en esta
-    clase, por lo que esta sera solo una clase abstracta que
-    brinda una solucion a CSC si se le proporciona una de TSC.
+    algun metodo de TSC en modo de decision, que puede detenerse
+    en cuanto se sabe que no cumple el umbral. Dicho metodo no
+    estara implementado en esta clase, por lo que esta sera solo
+    una clase abstracta que brinda una solucion a CSC si se le
+    proporciona una de TSC.
+
+    La busqueda comienza en la cota superior de CSC, galopa hacia
+    abajo hasta encontrar un k que no cumpla el umbral, y termina
+    con una Busqueda Binaria que no baja de la cota inferior. Cada
+    coloracion que cumple el umbral se intenta reducir a un color
+    menos antes de probar el siguiente k.
 """
 
+import numpy as np
 from code.graph_coloring import SpectrumGraphColoring
 
 
 class CSCBinarySearch(SpectrumGraphColoring):
 
+    def _reduce_colors(self, k, coloring, t, lower=1):
+        """Reduce una coloracion que cumple el umbral quitando su ultimo
+        color: cada vertice con ese color toma el color de menor potencial
+        interferencia entre los restantes. Se repite mientras la nueva
+        coloracion cumpla el umbral.
+
+        Args:
+            k (int): Numero de colores de la coloracion.
+            coloring (dict): Coloracion que cumple el umbral.
+            t (float): Umbral de interferencia permitido.
+            lower (int): Menor numero de colores a probar. Por defecto es 1.
+
+        Returns:
+            int, dict: Menor numero de colores alcanzado y su coloracion.
+        """
+        csr = self._csr_graph()
+        w = self._w_matrix()
+        colors = self._coloring_array(coloring)
+        degrees = np.diff(csr.offsets)
+        while k > lower:
+            moved = np.flatnonzero(colors == k - 1)
+            new_colors = colors.copy()
+            # los vertices de mayor grado eligen primero
+            for i in moved[np.argsort(-degrees[moved], kind='stable')].tolist():
+                neighbours = csr.neighbour_indices(i)
+                new_colors[i] = w[:k - 1, new_colors[neighbours]].sum(axis=1).argmin()
+            candidate = {v:self._spectrum[c] for v, c in zip(csr.labels.tolist(), new_colors.tolist())}
+            if self.threshold(candidate) > t:
+                break
+            k, colors, coloring = k - 1, new_colors, candidate
+        return k, coloring
+
     def ChromaticSpectrumColoring(self, t):
         """Determina el menor k que satisface con el umbral t
-        mediante una Busqueda Binaria entre 1 y |V|.
+        entre la cota inferior y la cota superior de CSC.
 
         Args:
             t (float): Umbral de interferencia permitido.
@@ -26,17 +65,39 @@ class CSCBinarySearch(SpectrumGraphColoring):
                 del grafo que cumple las restricciones.
         """            
         n_vertices = len(self.vertices())
-        c = {v:None for v in range(0, n_vertices)}
-        k = n_vertices
-        L = 1
-        R = n_vertices
+        L = min(self.csc_lower_bound(t), n_vertices)
+        k = max(L, min(n_vertices, int(self.csc_upper_bound(t))))
+        # el metodo de TSC puede no alcanzar la cota superior, en ese caso
+        # galopamos hacia arriba hasta encontrar un k que cumpla el umbral
+        step = 1
+        while True:
+            feasible, c = self.ThresholdSpectrumDecision(k, t)
+            if feasible:
+                break
+            L = k + 1
+            if k == n_vertices:
+                return n_vertices, {v:None for v in range(0, n_vertices)}
+            k = min(n_vertices, k + step)
+            step *= 2
+        k, c = self._reduce_colors(k, c, t, L)
+        # galopamos hacia abajo hasta encontrar un k que no cumpla el umbral
+        step = 1
+        while L < k:
+            k0 = max(L, k - step)
+            feasible, c0 = self.ThresholdSpectrumDecision(k0, t)
+            if not feasible:
+                L = k0 + 1
+                break
+            k, c = self._reduce_colors(k0, c0, t, L)
+            step *= 2
+        # Busqueda Binaria entre el ultimo k que no cumplio y el mejor encontrado
+        R = k - 1
         while L <= R:
             k0 = (L + R)//2
-            t0, c0 = self.ThresholdSpectrumColoring(k0)
-            if t0 <= t:
-                c = c0
-                k = k0
-                R = k0 - 1
+            feasible, c0 = self.ThresholdSpectrumDecision(k0, t)
+            if feasible:
+                k, c = self._reduce_colors(k0, c0, t, L)
+                R = k - 1
             else:
                 L = k0 + 1
-        return k, c
\ No newline at end of file
+        return k, c
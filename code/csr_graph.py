@@ -0,0 +1,377 @@
+""" Python Class
+    Clase de grafos en Python basada en arreglos de NumPy con
+    el formato CSR (compressed sparse row). Las listas de adyacencia
+    se guardan en dos arreglos contiguos de enteros: 'offsets', donde
+    los vecinos del vertice i ocupan el rango [offsets[i], offsets[i+1]),
+    e 'indices', con los indices de dichos vecinos. Las etiquetas de los
+    vertices se internan una sola vez en una tabla etiqueta -> indice.
+
+    Ofrece la misma interfaz de consulta que Graph (vertices, neighbours,
+    vertex_degree, Delta, ...), por lo que puede usarse directamente en
+    cualquier SpectrumGraphColoring, mientras que los caminos criticos
+    pueden trabajar con los indices sin hacer copias.
+"""
+
+import numpy as np
+from code.graph2 import Graph
+
+
+class CSRGraph(object):
+
+    def __init__(self, offsets, indices, labels=None):
+        """Inicializa un objeto CSRGraph a partir de sus arreglos CSR.
+        El grafo es inmutable una vez creado.
+
+        Args:
+            offsets (array): Arreglo de n+1 posiciones, los vecinos del vertice
+                i estan en indices[offsets[i]:offsets[i+1]].
+            indices (array): Arreglo con los indices de los vecinos de cada vertice.
+            labels (list, opcional): Etiqueta de cada vertice. Por defecto los
+                vertices se etiquetan como '1', '2', ..., 'n'.
+        """
+        indices = np.asarray(indices)
+        # usamos int32 mientras la cantidad de aristas lo permita
+        offsets_dtype = np.int32 if indices.shape[0] < 2**31 else np.int64
+        self._offsets = np.asarray(offsets, dtype=offsets_dtype)
+        self._indices = np.asarray(indices, dtype=np.int32)
+        # arreglo de objetos para traducir indices a etiquetas sin ciclos en Python,
+        # las etiquetas por defecto se crean solo cuando se consultan
+        self._labels = None
+        if labels is not None:
+            self._labels = np.empty(self.n_vertices(), dtype=object)
+            self._labels[:] = list(labels)
+        # tabla de internado etiqueta -> indice
+        self._index = None
+        self._degrees = None
+        self._repeated = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Crea un CSRGraph con las mismas listas de adyacencia que 'graph'.
+        Se respeta el orden de los vertices y de cada lista de adyacencia.
+
+        Args:
+            graph (Graph): Grafo en forma de lista de adyacencia.
+
+        Returns:
+            CSRGraph: Nuevo grafo.
+        """
+        if isinstance(graph, CSRGraph):
+            return graph
+        labels = graph.vertices()
+        index = {v:i for i, v in enumerate(labels)}
+        adjacency = [graph.neighbours(v) for v in labels]
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(adj) for adj in adjacency])
+        indices = np.fromiter((index[u] for adj in adjacency for u in adj),
+            dtype=np.int32, count=int(offsets[-1]))
+        return cls(offsets, indices, labels)
+
+    @classmethod
+    def from_edges(cls, n, src, dst, labels=None):
+        """Crea un CSRGraph no dirigido a partir de arreglos de aristas.
+        Cada arista (src[i], dst[i]) debe aparecer una sola vez, se agrega
+        en ambas direcciones. Las listas de adyacencia quedan ordenadas.
+
+        Args:
+            n (int): Cantidad de vertices.
+            src (array): Indice del primer vertice de cada arista.
+            dst (array): Indice del segundo vertice de cada arista.
+            labels (list, opcional): Etiqueta de cada vertice. Por defecto es None.
+
+        Returns:
+            CSRGraph: Nuevo grafo.
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        # ordenamos por vertice de origen y cada lista de adyacencia por indice,
+        # codificando cada par (origen, destino) en un unico entero
+        keys = np.concatenate([src * n + dst, dst * n + src])
+        keys.sort()
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(keys // n, minlength=n))
+        return cls(offsets, keys % n, labels)
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def indices(self):
+        return self._indices
+
+    @property
+    def labels(self):
+        if self._labels is None:
+            self._labels = np.empty(self.n_vertices(), dtype=object)
+            self._labels[:] = [str(i) for i in range(1, self.n_vertices() + 1)]
+        return self._labels
+
+    def _index_table(self):
+        """Tabla de internado de las etiquetas de los vertices.
+
+        Returns:
+            dict: Indice de cada vertice.
+        """
+        if self._index is None:
+            self._index = {v:i for i, v in enumerate(self.labels.tolist())}
+        return self._index
+
+    def n_vertices(self):
+        """Cantidad de vertices del grafo.
+
+        Returns:
+            int: Cantidad de vertices.
+        """
+        return self._offsets.shape[0] - 1
+
+    def index(self, vertex):
+        """Indice interno de un vertice del grafo.
+
+        Args:
+            vertex : Vertice del grafo.
+
+        Returns:
+            int: Indice del vertice.
+        """
+        return self._index_table()[vertex]
+
+    def label(self, i):
+        """Etiqueta del vertice con indice 'i'.
+
+        Args:
+            i (int): Indice del vertice.
+
+        Returns:
+            Vertice del grafo.
+        """
+        return self.labels[i]
+
+    def vertices(self):
+        """Vertices del grafo.
+
+        Returns:
+            list: Lista de vertices.
+        """
+        return self.labels.tolist()
+
+    def edges(self):
+        """Aristas del grafo.
+
+        Returns:
+            list: Lista de aristas.
+        """
+        return self._generate_edges()
+
+    def neighbour_indices(self, i):
+        """Indices de los vecinos del vertice con indice 'i'. El resultado
+        es una vista del arreglo 'indices', no una copia, y no debe modificarse.
+
+        Args:
+            i (int): Indice del vertice.
+
+        Returns:
+            array: Indices de los adyacentes al vertice.
+        """
+        return self._indices[self._offsets[i]:self._offsets[i + 1]]
+
+    def neighbours(self, vertex):
+        """Vecinos del vertice 'vertex'.
+        Se asume que este vertice pertenece al grafo.
+
+        Args:
+            vertex : Vertice del grafo.
+
+        Returns:
+            list: Lista de adyacentes a 'vertex'.
+        """
+        return self.labels[self.neighbour_indices(self._index_table()[vertex])].tolist()
+
+    def _generate_edges(self):
+        """Metodo que genera las aritas del grafo como tuplas.
+
+        Returns:
+            list: Lista de aristas del grafo.
+        """
+        rows = np.repeat(self.labels, np.diff(self._offsets))
+        return list(zip(rows.tolist(), self.labels[self._indices].tolist()))
+
+    def __str__(self):
+        res = "vertices: "
+        for k in self.labels:
+            res += str(k) + " "
+        res += "\nedges: "
+        for edge in self._generate_edges():
+            res += str(edge) + " "
+        return res
+
+    def degrees(self):
+        """Grados de los vertices del grafo ordenados por indice.
+        Al igual que en Graph, los lazos cuentan dos veces.
+
+        Returns:
+            array: Grado de cada vertice.
+        """
+        if self._degrees is None:
+            n = self.n_vertices()
+            lengths = np.diff(self._offsets)
+            rows = np.repeat(np.arange(n), lengths)
+            loops = np.bincount(rows[self._indices == rows], minlength=n)
+            self._degrees = lengths + loops
+        return self._degrees
+
+    def has_repeated_neighbours(self):
+        """Determina si alguna lista de adyacencia contiene un vecino repetido.
+
+        Returns:
+            bool: True si algun vecino se repite, False en otro caso.
+        """
+        if self._repeated is None:
+            n = self.n_vertices()
+            rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self._offsets))
+            keys = np.sort(rows*n + self._indices)
+            self._repeated = bool((keys[1:] == keys[:-1]).any())
+        return self._repeated
+
+    def vertex_degree(self, vertex):
+        """Grado de un vertice del grafo.
+
+        Args:
+            vertex : Vertice del grafo.
+
+        Returns:
+            int: Grado del vertice.
+        """
+        return int(self.degrees()[self._index_table()[vertex]])
+
+    def degree_sequence(self):
+        """Secuencia ordenada de los grados de los vertices
+        del grafo.
+
+        Returns:
+            tuple: Grados de los vertices del grafo.
+        """
+        return tuple(np.sort(self.degrees())[::-1].tolist())
+
+    def delta(self):
+        """Minimo grado del grafo.
+
+        Returns:
+            int: Minimo grado.
+        """
+        if not self.n_vertices():
+            return 100000000
+        return int(self.degrees().min())
+
+    def Delta(self):
+        """Maximo grado del grafo.
+
+        Returns:
+            int: Maximo grado.
+        """
+        if not self.n_vertices():
+            return 0
+        return int(self.degrees().max())
+
+    def _adjacency_positions(self, rows):
+        """Posiciones en el arreglo 'indices' de los vecinos de varios vertices.
+
+        Args:
+            rows (array): Indices de los vertices.
+
+        Returns:
+            array, array: Numero de orden en 'rows' del vertice de cada
+                posicion, y las posiciones.
+        """
+        starts = self._offsets[rows].astype(np.int64)
+        lengths = self._offsets[rows + 1] - starts
+        total = int(lengths.sum())
+        owner = np.repeat(np.arange(rows.shape[0]), lengths)
+        positions = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths) + starts[owner]
+        return owner, positions
+
+    def connected_components(self):
+        """Etiqueta las componentes conexas del grafo en tiempo lineal.
+        Cada componente se recorre por niveles a partir de su primer vertice,
+        expandiendo todos los vertices de un nivel de una vez. Se asume que
+        el grafo es no dirigido.
+
+        Returns:
+            int, array: Cantidad de componentes y numero de componente de cada
+                vertice, numeradas en el orden de su primer vertice.
+        """
+        n = self.n_vertices()
+        components = np.full(n, -1, dtype=np.int64)
+        lengths = np.diff(self._offsets).tolist()
+        count = 0
+        for seed in range(n):
+            if components[seed] >= 0:
+                continue
+            components[seed] = count
+            # los vertices aislados forman una componente por si solos
+            frontier = np.array([seed]) if lengths[seed] else None
+            while frontier is not None and frontier.shape[0]:
+                _, positions = self._adjacency_positions(frontier)
+                neighbours = self._indices[positions]
+                frontier = np.unique(neighbours[components[neighbours] < 0])
+                components[frontier] = count
+            count += 1
+        return count, components
+
+    def subgraph(self, vertices):
+        """Subgrafo inducido por un conjunto de vertices. Se respeta el
+        orden de los vertices dados y de cada lista de adyacencia.
+
+        Args:
+            vertices (array): Indices de los vertices del subgrafo.
+
+        Returns:
+            CSRGraph: Nuevo grafo.
+        """
+        vertices = np.asarray(vertices, dtype=np.int64)
+        new_index = np.full(self.n_vertices(), -1, dtype=np.int64)
+        new_index[vertices] = np.arange(vertices.shape[0])
+        owner, positions = self._adjacency_positions(vertices)
+        indices = new_index[self._indices[positions]]
+        inside = indices >= 0
+        offsets = np.zeros(vertices.shape[0] + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(owner[inside], minlength=vertices.shape[0]))
+        return CSRGraph(offsets, indices[inside], self.labels[vertices])
+
+    def to_graph(self):
+        """Convierte el grafo a un Graph con diccionario de adyacencia.
+
+        Returns:
+            Graph: Nuevo grafo.
+        """
+        return Graph({v:self.neighbours(v) for v in self.vertices()})
+
+
+
+if __name__ == "__main__":
+
+    g = { "a" : ["d"],
+          "b" : ["c"],
+          "c" : ["b", "d", "e"],
+          "d" : ["a", "c"],
+          "e" : ["c"],
+          "f" : []
+        }
+
+    graph = CSRGraph.from_graph(Graph(g))
+    print(graph)
+
+    for node in graph.vertices():
+        print(graph.vertex_degree(node))
+
+    print("The maximum degree of the graph is:")
+    print(graph.Delta())
+
+    print("The minimum degree of the graph is:")
+    print(graph.delta())
+
+    print("Neighbour indices of 'c':")
+    print(graph.neighbour_indices(graph.index("c")))
+
+    print("Degree Sequence: ")
+    print(graph.degree_sequence())
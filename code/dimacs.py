@@ -1,7 +1,64 @@
 """ Metodo para leer grafos en formato DIMACS
 """
 
-from code.graph2 import Graph
+import numpy as np
+from code.csr_graph import CSRGraph
+
+
+def dimacs_edges(path):
+    """Lee las aristas de un fichero en formato DIMACS ('p edge n m' seguido
+    de lineas 'e u v') o MatrixMarket (linea 'n n m' seguida de lineas 'u v').
+    Toda la seccion de aristas se lee de una vez en arreglos de NumPy, y se
+    eliminan los lazos y las aristas repetidas.
+
+    Args:
+        path (str): Ruta del fichero.
+
+    Returns:
+        int, array, array: Cantidad de vertices y extremos de cada arista,
+            indexados desde 0 y con el menor extremo primero.
+    """
+    with open(path) as fil:
+        n = m = 0
+        dimacs = False
+        # leemos la cabecera linea a linea hasta encontrar la primera arista,
+        # guardando su posicion para luego leer el resto del fichero de una vez
+        pos = fil.tell()
+        line = fil.readline()
+        while line:
+            tokens = line.split()
+            if not tokens or tokens[0] == 'c' or tokens[0][0] == '%':
+                pass
+            elif tokens[0] == 'p':
+                dimacs = True
+                n, m = int(tokens[2]), int(tokens[3])
+            elif tokens[0] == 'e' or dimacs or n:
+                break
+            else:
+                # linea de dimensiones de MatrixMarket 'filas columnas entradas'
+                n, m = max(int(tokens[0]), int(tokens[1])), int(tokens[2])
+            pos = fil.tell()
+            line = fil.readline()
+        fil.seek(pos)
+        if line and m:
+            # en DIMACS cada linea comienza con 'e', por lo que se
+            # ignora la primera columna
+            usecols = (1, 2) if dimacs else (0, 1)
+            comments = 'c' if dimacs else '%'
+            edges = np.loadtxt(fil, dtype=np.int64, comments=comments,
+                usecols=usecols, ndmin=2)
+        else:
+            edges = np.zeros((0, 2), dtype=np.int64)
+    src = edges[:, 0] - 1
+    dst = edges[:, 1] - 1
+    # eliminamos los lazos
+    loops = src == dst
+    src, dst = src[~loops], dst[~loops]
+    # eliminamos las aristas repetidas, en cualquiera de sus dos direcciones
+    keys = np.minimum(src, dst) * n + np.maximum(src, dst)
+    keys.sort()
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return n, keys // n, keys % n
 
 
 def dimacs_reader(path):
@@ -11,25 +68,7 @@ def dimacs_reader(path):
         path (str): Ruta del fichero.
 
     Returns:
-        Graph: Nuevo grafo.
-    """    
-    fil = open(path)
-    graph_dict = {}
-    for line in fil:
-        if line == '\n':
-            continue
-        line = line.split()
-        if line[0] == 'c' or (len(line[0])> 1 and line[0][0] == '%'):
-            continue
-        if line[0] == 'p':
-            graph_dict = {str(i):[] for i in range(1, int(line[2]) + 1)}
-        elif line[0] == 'e':
-            graph_dict[line[1]].append(line[2])
-            graph_dict[line[2]].append(line[1])
-        else:
-            if not graph_dict :
-                graph_dict = {str(i):[] for i in range(1, int(line[1]) + 1)}
-            else:
-                graph_dict[line[0]].append(line[1])
-                graph_dict[line[1]].append(line[0])
-    return Graph(graph_dict)
+        CSRGraph: Nuevo grafo.
+    """
+    n, src, dst = dimacs_edges(path)
+    return CSRGraph.from_edges(n, src, dst)
@@ -7,7 +7,9 @@
     vertice hasta ese momento.
 """
 
+import heapq
 import random
+import numpy as np
 from code.graph2 import Graph
 from code.secuencial_gc import SecuencialGraphColoring
 
@@ -25,8 +27,11 @@ class DSATURGraphColoring(SecuencialGraphColoring):
         """        
         # inicializamos la clase padre
         super().__init__(graph, spectrum, w)
-        # diccionario que almacenara el grado de saturacio de cada vertice
-        self._saturation_degree = {}
+        # arreglo que almacenara el grado de saturacion de cada vertice
+        self._saturation_degree = None
+        # cola con prioridad de los vertices no coloreados, con entradas
+        # (-saturacion, -grado, desempate aleatorio, indice del vertice)
+        self._saturation_heap = []
 
     def _new_coloring(self):
         """Devuelve una nueva coloracion vacia de los vertices del grafo y
@@ -35,37 +40,40 @@ class DSATURGraphColoring(SecuencialGraphColoring):
         Returns:
             dict: Nueva coloracion vacia de los vertices del grafo.
         """        
-        self._saturation_degree = {v:0 for v in self.vertices()}
-        return super()._new_coloring()
+        semi_coloring = super()._new_coloring()
+        n = self._csr.n_vertices()
+        # el arreglo de grados de saturacion se reutiliza entre coloraciones
+        if self._saturation_degree is None:
+            self._saturation_degree = np.zeros(n, dtype=np.int64)
+        else:
+            self._saturation_degree.fill(0)
+        degrees = np.diff(self._csr.offsets).tolist()
+        self._saturation_heap = [(0, -degrees[i], random.random(), i) for i in range(n)]
+        heapq.heapify(self._saturation_heap)
+        return semi_coloring
         
-    def _max_saturation_degree(self, vertices, semi_coloring):
+    def _max_saturation_degree(self, semi_coloring):
         """Determina el vertice no coloreado con mayor grado de saturacion
         en la coloracion parcial. En caso de un empate, se toma el de mayor
         grado dentro de ellos, y en caso de doble empate, se seleccionara de
         forma aleatoria.
+        Los vertices se extraen de una cola con prioridad que se actualiza de
+        forma perezosa: cada cambio del grado de saturacion agrega una nueva
+        entrada, y las entradas obsoletas se descartan al extraerlas. El valor
+        aleatorio de cada entrada hace que los empates se resuelvan de forma
+        uniforme.
 
         Args:
-            vertices (list): Lista de vertices del grafo.
             semi_coloring (dict): Coloracion parcial de los vertices del grafo.
 
         Returns:
             Vertice con mayor grado de saturacion.
         """        
-        best_v = []
-        for v in vertices:
-            # ignoramos los vertices ya coloreamos
-            if not semi_coloring[v]:
-                if not best_v:
-                    best_v = [v]
-                if self._saturation_degree[v] > self._saturation_degree[best_v[0]]:
-                    best_v = [v]
-                elif self._saturation_degree[v] == self._saturation_degree[best_v[0]] and \
-                        self._vertex_degree[v] > self._vertex_degree[best_v[0]]:
-                    best_v = [v]
-                elif self._saturation_degree[v] == self._saturation_degree[best_v[0]] and \
-                        self._vertex_degree[v] == self._vertex_degree[best_v[0]]:
-                    best_v.append(v)
-        return random.choice(best_v)
+        while True:
+            saturation, _, _, i = heapq.heappop(self._saturation_heap)
+            # ignoramos los vertices ya coloreados y las entradas obsoletas
+            if self._vertex_color[i] < 0 and -saturation == self._saturation_degree[i]:
+                return self._csr.label(i)
 
     def _update_values(self, vertex, color, semi_coloring, aupdate=False, update_color=False):
         """Actualiza la potencial interferencia y el grado de saturacion de los 
@@ -85,9 +93,14 @@ class DSATURGraphColoring(SecuencialGraphColoring):
                 es False.
         """        
         # sumamos 1 al grado de saturacion de cada vecino del vertice
-        for w in self._graph.neighbours(vertex):
-            self._saturation_degree[w]+=1
+        neighbours = self._csr.neighbour_indices(self._csr.index(vertex))
+        np.add.at(self._saturation_degree, neighbours, 1)
         super()._update_values(vertex, color, semi_coloring, aupdate, update_color)
+        # agregamos a la cola la nueva prioridad de los vecinos no coloreados
+        uncolored = neighbours[self._vertex_color[neighbours] < 0]
+        degrees = self._csr.offsets[uncolored + 1] - self._csr.offsets[uncolored]
+        for u, saturation, degree in zip(uncolored.tolist(), self._saturation_degree[uncolored].tolist(), degrees.tolist()):
+            heapq.heappush(self._saturation_heap, (-saturation, -degree, random.random(), u))
 
     def ThresholdSpectrumColoring(self, k):
         """Determina el minimo umbral k-cromatico de TSC 
@@ -108,7 +121,7 @@ class DSATURGraphColoring(SecuencialGraphColoring):
         n_vertices = len(self.vertices())
         while n_colored < n_vertices:
             # tomamos el vertice de mayor grado de saturacion
-            vertex = self._max_saturation_degree(self.vertices(), semi_coloring)
+            vertex = self._max_saturation_degree(semi_coloring)
             self._vertex_order.append(vertex)
             # tomamos el color con la menor potencial interferencia para el vertice
             color = self._min_semi_interference(vertex, semi_coloring, spectrum)
@@ -117,7 +130,8 @@ class DSATURGraphColoring(SecuencialGraphColoring):
             n_colored+=1
             # actualizamos los valores de las memorias
             self._update_values(vertex, color, semi_coloring)
-        return self.threshold(semi_coloring), semi_coloring
+        # evaluamos la coloracion con el arreglo de colores de la memoria
+        return self.threshold(self._vertex_color), semi_coloring
 
     def ChromaticSpectrumColoring(self, t):
         """Determina el numero cromatico de t-interferencia de CSC
@@ -136,7 +150,7 @@ class DSATURGraphColoring(SecuencialGraphColoring):
         n_vertices = len(self.vertices())
         while n_colored < n_vertices:
             # tomamos el vertice de mayor grado de saturacion
-            vertex = self._max_saturation_degree(self.vertices(), semi_coloring)
+            vertex = self._max_saturation_degree(semi_coloring)
             # intentamos colorear el vertice con cada color garantizando
             # que no superaremos el umbral t
             self._try_color(vertex, semi_coloring, t)
@@ -146,7 +160,9 @@ class DSATURGraphColoring(SecuencialGraphColoring):
                 return n_vertices, {v:None for v in self.vertices()}
             else:
                 n_colored+=1
-        return int(max(semi_coloring.values())), semi_coloring
+        # los colores se toman en el orden del espectro, por lo que el numero
+        # de colores es el mayor indice de color usado mas uno
+        return self._color_counts.n_colors, semi_coloring
 
     def _try_color(self, vertex, semi_coloring, t):
         """Intenta colorear el vertice con cada color
@@ -158,23 +174,31 @@ class DSATURGraphColoring(SecuencialGraphColoring):
             t (float): Umbral de interferencia permitido.
         """        
         I = 1e10        
-        for c in self._spectrum:
+        i = self._csr.index(vertex)
+        # potencial interferencia del vertice con cada color, hasta el primer
+        # color que no interfiere con ningun color usado
+        row = self._potential_row(i, len(self._spectrum)).tolist()
+        for j, c in enumerate(self._spectrum):
+            # los colores siguientes tampoco interfieren con ningun color
+            # usado, por lo que se comportan igual que el ultimo de la fila
+            if j >= len(row):
+                break
             # interferencia del vertice con el color c
-            I = self._color_interference[vertex][c]
+            I = row[j]
             # si el vertice no tiene vecinos le asignamos el primer color
-            if len(self._graph.neighbours(vertex)) == 0:
+            if self._vertex_degree[vertex] == 0:
                 semi_coloring[vertex] = c
                 self._update_values(vertex, c, semi_coloring, aupdate=True)
                 break
             # comprobamos que la interferencia del vertice no exceda la razon
             # entre el numero de vecinos coloreados (= grado de saturacion) y 
             # el total de vecinos del umbral t
-            if I > self._saturation_degree[vertex]/len(self._graph.neighbours(vertex))*t:
+            if I > self._saturation_degree[i]/self._vertex_degree[vertex]*t:
                 continue
             semi_coloring[vertex] = c
             # comprobamos que la relacion anterior sea cumplida ademas por cada vecino del vertice
             if all([1 if not semi_coloring[w] else self._semi_interference(w, semi_coloring) <= \
-                (self._saturation_degree[w]+1)/len(self._graph.neighbours(w))*t for w in self._graph.neighbours(vertex)]):
+                (self._saturation_degree[self._csr.index(w)]+1)/self._vertex_degree[w]*t for w in self._graph.neighbours(vertex)]):
                 # en caso que se cumpla la razon para el vertice y para sus vecinos, aseguramos
                 # que el umbral t no se superara al asignar el color c al vertice
                 self._update_values(vertex, c, semi_coloring, aupdate=True)
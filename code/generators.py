@@ -0,0 +1,201 @@
+""" Metodos para generar grafos aleatorios grandes directamente en
+    formato CSR, sin construir matrices de adyacencia densas. El costo
+    de cada generador es proporcional a la cantidad de vertices y de
+    aristas generadas.
+"""
+
+import numpy as np
+from code.csr_graph import CSRGraph
+
+# maxima cantidad de muestras generadas en cada bloque
+BLOCK_SIZE = 1 << 22
+
+
+def _row_start(i, n):
+    """Posicion del primer par de la fila 'i' del triangulo superior."""
+    return i*(n - 1) - i*(i - 1)//2
+
+
+def gnp_edges(n, p, seed=None):
+    """Genera las aristas de un grafo aleatorio G(n, p), donde cada par
+    de vertices esta conectado con probabilidad 'p'. En lugar de lanzar
+    una moneda por cada par, se generan directamente los saltos entre
+    pares conectados, que siguen una distribucion geometrica (metodo de
+    Batagelj y Brandes), en bloques vectorizados.
+
+    Args:
+        n (int): Cantidad de vertices del grafo.
+        p (float): Probabilidad de que dos vertices del grafo esten conectados.
+        seed (int, opcional): Semilla o numpy.random.Generator. Por defecto es None.
+
+    Returns:
+        array, array: Extremos de cada arista, con src < dst.
+    """
+    rng = np.random.default_rng(seed)
+    # cantidad de pares de vertices, numerados por filas en el triangulo superior
+    n_pairs = n*(n - 1)//2
+    if p <= 0 or n_pairs == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if p >= 1:
+        src, dst = np.triu_indices(n, 1)
+        return src.astype(np.int64), dst.astype(np.int64)
+    blocks = []
+    last = -1
+    while last < n_pairs - 1:
+        # generamos un poco mas de los saltos esperados hasta el final
+        remaining = n_pairs - 1 - last
+        mean = remaining*p
+        size = min(int(mean + 4*np.sqrt(mean*(1 - p)) + 16), BLOCK_SIZE)
+        positions = last + np.cumsum(rng.geometric(p, size))
+        blocks.append(positions[positions < n_pairs])
+        last = positions[-1]
+    pairs = np.concatenate(blocks)
+    # convertimos cada posicion en su par (i, j), la fila i comienza en la
+    # posicion i*(n - 1) - i*(i - 1)/2
+    b = 2*n - 1
+    src = np.floor((b - np.sqrt(b*b - 8.0*pairs))/2).astype(np.int64)
+    # corregimos los posibles errores de redondeo de la raiz
+    src -= _row_start(src, n) > pairs
+    src += _row_start(src + 1, n) <= pairs
+    dst = pairs - _row_start(src, n) + src + 1
+    return src, dst
+
+
+def gnp_random_graph(n, p, seed=None):
+    """Crea un grafo aleatorio G(n, p) de 'n' vertices con una probabilidad
+    de conexion 'p', en tiempo proporcional a n + m.
+
+    Args:
+        n (int): Cantidad de vertices del grafo.
+        p (float): Probabilidad de que dos vertices del grafo esten conectados.
+        seed (int, opcional): Semilla o numpy.random.Generator. Por defecto es None.
+
+    Returns:
+        CSRGraph: Nuevo grafo.
+    """
+    src, dst = gnp_edges(n, p, seed)
+    return CSRGraph.from_edges(n, src, dst)
+
+
+def deployment_positions(n, width=1.0, height=1.0, distribution='uniform', n_clusters=None, cluster_std=None, seed=None):
+    """Genera las posiciones de 'n' transmisores en un area rectangular.
+
+    Args:
+        n (int): Cantidad de transmisores.
+        width (float): Ancho del area. Por defecto es 1.0.
+        height (float): Alto del area. Por defecto es 1.0.
+        distribution (str): Distribucion de los transmisores, 'uniform' para una
+            distribucion uniforme, 'clustered' para grupos con distribucion normal
+            alrededor de centros aleatorios, o 'grid' para una cuadricula regular
+            con una pequena perturbacion. Por defecto es 'uniform'.
+        n_clusters (int, opcional): Cantidad de grupos en la distribucion 'clustered'.
+            Por defecto es un grupo por cada 100 transmisores.
+        cluster_std (float, opcional): Desviacion estandar de cada grupo en la distribucion
+            'clustered'. Por defecto es el 5% del menor lado del area.
+        seed (int, opcional): Semilla o numpy.random.Generator. Por defecto es None.
+
+    Returns:
+        array: Arreglo de n x 2 con las posiciones de los transmisores.
+    """
+    rng = np.random.default_rng(seed)
+    size = np.array([width, height], dtype=np.float64)
+    if distribution == 'uniform':
+        return rng.uniform(0, 1, (n, 2))*size
+    if distribution == 'clustered':
+        if n_clusters is None:
+            n_clusters = max(1, n//100)
+        if cluster_std is None:
+            cluster_std = 0.05*min(width, height)
+        centers = rng.uniform(0, 1, (n_clusters, 2))*size
+        positions = centers[rng.integers(0, n_clusters, n)] + rng.normal(0, cluster_std, (n, 2))
+        return np.clip(positions, 0, size)
+    if distribution == 'grid':
+        # cuadricula con celdas aproximadamente cuadradas y al menos n puntos
+        columns = max(1, int(np.ceil(np.sqrt(n*width/height))))
+        rows = -(-n//columns)
+        spacing = size/[columns, rows]
+        cells = np.arange(n)
+        positions = (np.stack([cells % columns, cells//columns], axis=1) + 0.5)*spacing
+        positions += rng.uniform(-0.1, 0.1, (n, 2))*spacing
+        return positions
+    raise ValueError('distribucion desconocida: {}'.format(distribution))
+
+
+def geometric_edges(positions, radius):
+    """Determina los pares de puntos a distancia a lo sumo 'radius'. Los puntos
+    se agrupan en una cuadricula de celdas de lado 'radius', por lo que solo se
+    comparan los puntos de celdas vecinas.
+
+    Args:
+        positions (array): Arreglo de n x 2 con las posiciones de los puntos.
+        radius (float): Radio de interferencia.
+
+    Returns:
+        array, array: Extremos de cada arista.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    n = positions.shape[0]
+    if n == 0 or radius <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    cells = np.floor((positions - positions.min(axis=0))/radius).astype(np.int64)
+    n_rows = cells[:, 1].max() + 1
+    cell_id = cells[:, 0]*n_rows + cells[:, 1]
+    # ordenamos los puntos por celda, los puntos de cada celda quedan contiguos
+    order = np.argsort(cell_id, kind='stable')
+    sorted_id = cell_id[order]
+    cx, cy = cells[order, 0], cells[order, 1]
+    points = positions[order]
+    rank = np.arange(n)
+    src_blocks, dst_blocks = [], []
+    # solo se recorre la mitad de las celdas vecinas para encontrar cada par una vez
+    for dx, dy in [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]:
+        valid = (cy + dy >= 0) & (cy + dy < n_rows)
+        target = (cx + dx)*n_rows + cy + dy
+        lo = np.searchsorted(sorted_id, target, 'left')
+        hi = np.searchsorted(sorted_id, target, 'right')
+        if dx == dy == 0:
+            # en la misma celda solo se toman los puntos posteriores
+            lo = rank + 1
+        counts = np.where(valid, hi - lo, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        # expandimos cada rango [lo, hi) en la lista de pares candidatos
+        a = np.repeat(rank, counts)
+        b = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+        close = ((points[a] - points[b])**2).sum(axis=1) <= radius*radius
+        src_blocks.append(order[a[close]])
+        dst_blocks.append(order[b[close]])
+    if not src_blocks:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(src_blocks), np.concatenate(dst_blocks)
+
+
+def geometric_graph(n, radius, width=1.0, height=1.0, distribution='uniform', n_clusters=None, cluster_std=None, seed=None, return_positions=False):
+    """Crea el grafo de interferencias de una red inalambrica aleatoria: se
+    ubican 'n' transmisores en un area y se conectan los pares que esten a
+    distancia a lo sumo 'radius'.
+
+    Args:
+        n (int): Cantidad de transmisores.
+        radius (float): Radio de interferencia.
+        width (float): Ancho del area. Por defecto es 1.0.
+        height (float): Alto del area. Por defecto es 1.0.
+        distribution (str): Distribucion de los transmisores ('uniform', 'clustered'
+            o 'grid'). Por defecto es 'uniform'.
+        n_clusters (int, opcional): Cantidad de grupos en la distribucion 'clustered'.
+        cluster_std (float, opcional): Desviacion estandar de cada grupo en la
+            distribucion 'clustered'.
+        seed (int, opcional): Semilla o numpy.random.Generator. Por defecto es None.
+        return_positions (bool): Se devuelven tambien las posiciones de los
+            transmisores si es True. Por defecto es False.
+
+    Returns:
+        CSRGraph: Nuevo grafo, y las posiciones si 'return_positions' es True.
+    """
+    positions = deployment_positions(n, width, height, distribution, n_clusters, cluster_std, seed)
+    src, dst = geometric_edges(positions, radius)
+    graph = CSRGraph.from_edges(n, src, dst)
+    if return_positions:
+        return graph, positions
+    return graph
@@ -0,0 +1,203 @@
+""" Metodos para guardar y cargar grafos en un formato binario compacto.
+    El fichero contiene una cabecera y los arreglos 'offsets' e 'indices'
+    del grafo en formato CSR, alineados para poder cargarlos mediante
+    numpy.memmap. Asi, cargar de nuevo un grafo solo mapea el fichero en
+    memoria, y varios procesos que usen el mismo grafo comparten sus paginas.
+
+    Formato del fichero:
+        MAGIC (8 bytes) | longitud de la cabecera (uint32) | cabecera JSON |
+        relleno | offsets | relleno | indices
+"""
+
+import os
+import json
+import struct
+import hashlib
+import numpy as np
+from code.csr_graph import CSRGraph
+from code.dimacs import dimacs_reader
+
+MAGIC = b'SGCGRAPH'
+VERSION = 1
+# alineacion en bytes del inicio de cada arreglo
+ALIGN = 64
+# extension de los ficheros de cache
+CACHE_SUFFIX = '.sgc'
+
+
+def _aligned(position):
+    return -(-position // ALIGN) * ALIGN
+
+
+def source_signature(path, digest=True):
+    """Firma de un fichero fuente: su tamano, su fecha de modificacion
+    y el hash SHA-1 de su contenido.
+
+    Args:
+        path (str): Ruta del fichero.
+        digest (bool): Se calcula el hash del contenido si es True. Por defecto es True.
+
+    Returns:
+        dict: Firma del fichero.
+    """
+    stat = os.stat(path)
+    signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': None}
+    if digest:
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(1 << 20), b''):
+                sha1.update(block)
+        signature['sha1'] = sha1.hexdigest()
+    return signature
+
+
+def save_graph(graph, path, source=None):
+    """Guarda un grafo en formato binario. El fichero se escribe primero
+    con un nombre temporal y luego se renombra, por lo que otro proceso
+    nunca vera un fichero a medio escribir.
+
+    Args:
+        graph (Graph): Grafo a guardar, se convierte a CSR si es necesario.
+        path (str): Ruta del fichero.
+        source (dict, opcional): Firma del fichero fuente del grafo. Por defecto es None.
+    """
+    graph = CSRGraph.from_graph(graph)
+    n = graph.n_vertices()
+    labels = graph.vertices()
+    # las etiquetas por defecto '1', ..., 'n' no se guardan
+    if labels == [str(i) for i in range(1, n + 1)]:
+        labels = None
+    offsets = np.ascontiguousarray(graph.offsets)
+    indices = np.ascontiguousarray(graph.indices)
+    header = {
+        'version': VERSION,
+        'n': n,
+        'nnz': int(indices.shape[0]),
+        'offsets_dtype': offsets.dtype.str,
+        'indices_dtype': indices.dtype.str,
+        'labels': labels,
+        'source': source
+    }
+    # calculamos la posicion de cada arreglo hasta que la cabecera sea estable,
+    # ya que las propias posiciones forman parte de ella
+    header['offsets_start'] = header['indices_start'] = 0
+    while True:
+        raw = json.dumps(header).encode()
+        offsets_start = _aligned(len(MAGIC) + 4 + len(raw))
+        indices_start = _aligned(offsets_start + offsets.nbytes)
+        if (offsets_start, indices_start) == (header['offsets_start'], header['indices_start']):
+            break
+        header['offsets_start'], header['indices_start'] = offsets_start, indices_start
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(tmp_path, 'wb') as handle:
+            handle.write(MAGIC + struct.pack('<I', len(raw)) + raw)
+            handle.write(b'\0' * (offsets_start - handle.tell()))
+            handle.write(offsets.tobytes())
+            handle.write(b'\0' * (indices_start - handle.tell()))
+            handle.write(indices.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_header(path):
+    """Lee la cabecera de un fichero de grafo binario.
+
+    Args:
+        path (str): Ruta del fichero.
+
+    Returns:
+        dict: Cabecera del fichero, o None si el fichero no es valido.
+    """
+    with open(path, 'rb') as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            return None
+        size, = struct.unpack('<I', handle.read(4))
+        header = json.loads(handle.read(size).decode())
+    if header.get('version') != VERSION:
+        return None
+    return header
+
+
+def load_graph(path, header=None):
+    """Carga un grafo en formato binario. Los arreglos del grafo se mapean
+    en memoria en modo de solo lectura, sin copiarlos.
+
+    Args:
+        path (str): Ruta del fichero.
+        header (dict, opcional): Cabecera ya leida del fichero. Por defecto es None.
+
+    Returns:
+        CSRGraph: Grafo guardado en el fichero.
+    """
+    if header is None:
+        header = read_header(path)
+        if header is None:
+            raise ValueError('{} no es un fichero de grafo valido'.format(path))
+    offsets = np.memmap(path, dtype=np.dtype(header['offsets_dtype']), mode='r',
+        offset=header['offsets_start'], shape=(header['n'] + 1,))
+    if header['nnz']:
+        indices = np.memmap(path, dtype=np.dtype(header['indices_dtype']), mode='r',
+            offset=header['indices_start'], shape=(header['nnz'],))
+    else:
+        # numpy.memmap no admite arreglos vacios
+        indices = np.zeros(0, dtype=np.dtype(header['indices_dtype']))
+    return CSRGraph(offsets, indices, header['labels'])
+
+
+def cache_path(path):
+    """Ruta del fichero de cache asociado a un fichero fuente.
+
+    Args:
+        path (str): Ruta del fichero fuente.
+
+    Returns:
+        str: Ruta del fichero de cache.
+    """
+    return path + CACHE_SUFFIX
+
+
+def _is_fresh(header, path):
+    """Comprueba que la cache fue creada a partir del contenido actual
+    del fichero fuente. Si el tamano y la fecha coinciden se confia en
+    la cache, si solo coincide el tamano se compara el hash del contenido.
+    """
+    source = header.get('source')
+    if not source:
+        return False
+    signature = source_signature(path, digest=False)
+    if signature['size'] != source['size']:
+        return False
+    if signature['mtime_ns'] == source['mtime_ns']:
+        return True
+    return source_signature(path)['sha1'] == source['sha1']
+
+
+def cached_dimacs_reader(path):
+    """Crea un grafo a partir de un fichero en formato DIMACS, usando una
+    cache binaria guardada junto al fichero. Si la cache existe y corresponde
+    al contenido actual del fichero se mapea en memoria, en otro caso se lee
+    el fichero y se crea la cache para las siguientes ejecuciones.
+
+    Args:
+        path (str): Ruta del fichero.
+
+    Returns:
+        CSRGraph: Nuevo grafo.
+    """
+    cache = cache_path(path)
+    if os.path.isfile(cache):
+        header = read_header(cache)
+        if header is not None and _is_fresh(header, path):
+            return load_graph(cache, header)
+    signature = source_signature(path)
+    graph = dimacs_reader(path)
+    try:
+        save_graph(graph, cache, signature)
+    except OSError:
+        # si no se puede escribir junto al fichero se trabaja sin cache
+        pass
+    return graph
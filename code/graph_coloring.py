@@ -23,9 +23,57 @@
         cromatico de t-interferencia de (G, W).
 """
 
+import os
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from code.graph2 import Graph
+from code.csr_graph import CSRGraph
+from code.banded_w import BandedW
+from code.result_cache import instance_fingerprint
 from code.gcd import lgcd
 
+# maxima cantidad de celdas de la tabla de potenciales interferencias
+# que se calculan de una vez
+TABLE_BLOCK_SIZE = 1 << 22
+
+
+# espectro y matriz de interferencias de un proceso que resuelve componentes,
+# se reciben una sola vez al crear el proceso en lugar de con cada componente
+_worker_problem = None
+
+
+def _init_component_worker(spectrum, w):
+    """Guarda el espectro y la matriz de interferencias en un proceso que
+    resuelve componentes.
+
+    Args:
+        spectrum (list): Espectro de colores.
+        w (array): Matriz de interferencias entre los colores.
+    """
+    global _worker_problem
+    _worker_problem = spectrum, w
+
+
+def _solve_component(task, problem=None):
+    """Resuelve TSC o CSC en una componente conexa. Es una funcion del
+    modulo para poder ejecutarla en otro proceso.
+
+    Args:
+        task (tuple): Clase del metodo, grafo de la componente, nombre del
+            metodo a ejecutar, su argumento y la semilla de 'random' para
+            la componente.
+        problem (tuple, opcional): Espectro y matriz de interferencias. Por
+            defecto son los recibidos al crear el proceso.
+
+    Returns:
+        float o int, dict: Resultado del metodo en la componente.
+    """
+    cls, graph, method, arg, seed = task
+    spectrum, w = problem if problem is not None else _worker_problem
+    random.seed(seed)
+    return getattr(cls(graph, spectrum, w), method)(arg)
+
 
 class SpectrumGraphColoring(object):
 
@@ -36,13 +84,32 @@ class SpectrumGraphColoring(object):
         Args:
             graph (Graph): Grafo en forma de lista de adyacencia.
             spectrum (list): Espectro de colores.
-            w (dict): Matriz de interferencias entre los colores.
+            w (dict): Matriz de interferencias entre los colores, un arreglo de
+                |S| x |S| con las filas y columnas en el orden del espectro, o una
+                matriz de banda BandedW.
             c (dict, opcional): Coloracion del grado. Por defecto es None.
         """        
+        if isinstance(w, (BandedW, np.ndarray)) and w.shape != (len(spectrum), len(spectrum)):
+            raise ValueError('la matriz de interferencias no tiene {} colores'.format(len(spectrum)))
         self._graph = graph
         self._spectrum = spectrum
         self._w = w
         self._c = c
+        # indice de cada color en el espectro
+        self._color_index = {color:i for i, color in enumerate(spectrum)}
+        # representaciones en arreglos del grafo y de la matriz de interferencias,
+        # se crean la primera vez que se necesitan
+        self._csr = None
+        self._edge_sources = None
+        self._w_array = None
+        # ancho de banda de la matriz de interferencias, se calcula la primera
+        # vez que se necesita
+        self._bandwidth = None
+        # cache de resultados de TSC, la semilla de los resultados y el hash
+        # de la instancia
+        self._cache = None
+        self._seed = None
+        self._fingerprint = None
 
     def set_coloring(self, c):
         """Colorea el grafo.
@@ -51,6 +118,52 @@ class SpectrumGraphColoring(object):
             c (dict): Nueva coloracion del grafo.
         """        
         self._c = c
+
+    def set_cache(self, cache, seed=0):
+        """Usa una cache para los resultados de TSC. Cada resultado se
+        calcula con 'random' inicializado a partir de la semilla y de los
+        parametros del problema, por lo que un mismo problema siempre tiene
+        el mismo resultado y puede tomarse de la cache.
+
+        Args:
+            cache (ResultCache): Cache de resultados, None para no usar cache.
+            seed (int): Semilla de los resultados. Por defecto es 0.
+        """
+        self._cache = cache
+        self._seed = seed
+
+    def CachedThresholdSpectrumColoring(self, k, *args, **kargs):
+        """Resuelve TSC usando la cache de resultados de la clase. Sin
+        cache es igual que 'ThresholdSpectrumColoring'. Los argumentos
+        adicionales se pasan al metodo y forman parte de la clave.
+
+        Args:
+            k (int): Numero de colores permitidos.
+
+        Returns:
+            float, dict: Minimo umbral k-cromatico, coloracion
+                del grafo que cumple las restricciones.
+        """
+        if self._cache is None:
+            return self.ThresholdSpectrumColoring(k, *args, **kargs)
+        if self._fingerprint is None:
+            self._fingerprint = instance_fingerprint(self._csr_graph(), self._spectrum, self._w_matrix())
+        cls = type(self)
+        params = (self._fingerprint, cls.__module__, cls.__qualname__,
+            'ThresholdSpectrumColoring', k, self._seed, 'compact')
+        # sin argumentos adicionales la clave es la misma de antes
+        if args or kargs:
+            params += (args, tuple(sorted(kargs.items())))
+        key = self._cache.key(*params)
+        result = self._cache.get(key)
+        if result is None:
+            random.seed(key)
+            t, coloring = self.ThresholdSpectrumColoring(k, *args, **kargs)
+            # la coloracion se guarda como arreglo compacto
+            result = t, self.compact_coloring(coloring)
+            self._cache.put(key, result)
+        t, colors = result
+        return t, self.labelled_coloring(colors)
     
     def vertices(self):
         """Vertices del grafo.
@@ -60,6 +173,132 @@ class SpectrumGraphColoring(object):
         """   
         return self._graph.vertices()
 
+    def _csr_graph(self):
+        """Grafo en formato CSR, con los vertices en el mismo orden
+        que 'self.vertices()'.
+
+        Returns:
+            CSRGraph: Grafo en formato CSR.
+        """
+        if self._csr is None:
+            self._csr = CSRGraph.from_graph(self._graph)
+            # vertice de origen de cada entrada del arreglo 'indices'
+            self._edge_sources = np.repeat(np.arange(self._csr.n_vertices(), dtype=np.int32),
+                np.diff(self._csr.offsets))
+        return self._csr
+
+    def _w_matrix(self):
+        """Matriz de interferencias como arreglo de NumPy, con las filas
+        y columnas en el orden del espectro. Los arreglos y las matrices de
+        banda se usan directamente, ya que admiten el mismo acceso por indices.
+
+        Returns:
+            array: Matriz de |S| x |S| de interferencias.
+        """
+        if isinstance(self._w, (BandedW, np.ndarray)):
+            return self._w
+        if self._w_array is None:
+            self._w_array = np.array([[self._w[c1][c2] for c2 in self._spectrum]
+                for c1 in self._spectrum], dtype=np.float64)
+        return self._w_array
+
+    def _w_bandwidth(self):
+        """Mayor distancia entre dos colores con interferencia no nula. Para
+        una matriz que no es de banda se calcula una sola vez a partir de
+        sus entradas no nulas.
+
+        Returns:
+            int: Ancho de banda de la matriz de interferencias.
+        """
+        w = self._w_matrix()
+        if isinstance(w, BandedW):
+            return w.bandwidth
+        if self._bandwidth is None:
+            rows, cols = np.nonzero(w)
+            self._bandwidth = int(np.abs(rows - cols).max()) if rows.shape[0] else 0
+        return self._bandwidth
+
+    def _coloring_array(self, c=None):
+        """Convierte una coloracion en un arreglo con el indice del color
+        de cada vertice, en el orden de 'self.vertices()'. Los arreglos de
+        indices, como los de 'compact_coloring', se usan directamente.
+
+        Args:
+            c (dict): Coloracion del grafo, o arreglo con el indice del color
+                de cada vertice. Por defecto es None.
+
+        Returns:
+            array: Indice del color de cada vertice.
+        """
+        if isinstance(c, np.ndarray):
+            return c.astype(np.intp, copy=False)
+        if not c:
+            c = self._c
+        csr = self._csr_graph()
+        return np.fromiter((self._color_index[c[v]] for v in csr.labels),
+            dtype=np.intp, count=csr.n_vertices())
+
+    def _compact_dtype(self):
+        """Tipo de entero sin signo mas pequeño para los indices de los colores,
+        dejando el mayor valor del tipo para los vertices sin color."""
+        if len(self._spectrum) < np.iinfo(np.uint16).max:
+            return np.uint16
+        return np.uint32
+
+    def compact_coloring(self, c=None):
+        """Convierte una coloracion en un arreglo compacto de enteros sin signo
+        de 16 o 32 bits con el indice del color de cada vertice, en el orden
+        de 'self.vertices()'. Los vertices sin color toman el mayor valor del
+        tipo. Se usara la coloracion de la clase en caso que c sea None.
+
+        Args:
+            c (dict): Coloracion del grafo, o arreglo con el indice del color
+                de cada vertice (-1 para los vertices sin color). Por defecto es None.
+
+        Returns:
+            array: Indice del color de cada vertice.
+        """
+        dtype = self._compact_dtype()
+        uncolored = np.iinfo(dtype).max
+        if isinstance(c, np.ndarray):
+            return np.where(c < 0, uncolored, c).astype(dtype)
+        if not c:
+            c = self._c
+        csr = self._csr_graph()
+        return np.fromiter((self._color_index.get(c[v], uncolored) for v in csr.labels),
+            dtype=dtype, count=csr.n_vertices())
+
+    def labelled_coloring(self, colors):
+        """Convierte un arreglo compacto de 'compact_coloring' en una coloracion
+        con los vertices y colores del grafo y del espectro.
+
+        Args:
+            colors (array): Indice del color de cada vertice.
+
+        Returns:
+            dict: Coloracion del grafo, con None en los vertices sin color.
+        """
+        spectrum = self._spectrum
+        s_size = len(spectrum)
+        return {v:spectrum[i] if 0 <= i < s_size else None
+            for v, i in zip(self._csr_graph().labels.tolist(), np.asarray(colors).tolist())}
+
+    def interference_array(self, c=None):
+        """Interferencia de todos los vertices en una coloracion.
+        Se evalua W[c[u], c[v]] para cada arista (u, v) del grafo de una
+        vez, y se suman los valores de cada vertice.
+
+        Args:
+            c (dict): Coloracion del grafo, o su arreglo compacto. Por defecto es None.
+
+        Returns:
+            array: Interferencia de cada vertice, en el orden de 'self.vertices()'.
+        """
+        csr = self._csr_graph()
+        colors = self._coloring_array(c)
+        values = self._w_matrix()[colors[self._edge_sources], colors[csr.indices]]
+        return np.bincount(self._edge_sources, weights=values, minlength=csr.n_vertices())
+
     def vertex_interference(self, vertex, c=None):
         """Interferencia de un vertice en una coloracion.
         La interferencia de un vertice es la suma entre las
@@ -95,12 +334,13 @@ class SpectrumGraphColoring(object):
         # usamos la coloracion de la clase en caso que 'c' sea None     
         if not c:
             c = self._c
+        w = self._w_matrix()
+        row = self._color_index[color]
         interference = 0
         # sumamos las interferencias entre 'color' y cada uno
         # de los colores de los adyacentes a 'vertex'
         for neighbour in self._graph.neighbours(vertex):
-            neighbour_color = c[neighbour]
-            interference += self._w[color][neighbour_color]
+            interference += w[row, self._color_index[c[neighbour]]]
         return interference
         
     def is_wstable(self, c=None):
@@ -115,12 +355,84 @@ class SpectrumGraphColoring(object):
         Returns:
             bool: True si la coloracion es w-estable, False en otro caso.
         """        
-        for vertex in self._graph.vertices():
-            vertex_interference = self.vertex_interference(vertex, c)
-            for color in self._spectrum:
-                if self._potential_interference(vertex, color, c) < vertex_interference:
-                    return False
-        return True
+        return not self.unstable_vertices(c)
+
+    def _potential_interference_blocks(self, colors):
+        """Calcula la tabla de potenciales interferencias por bloques de vertices.
+        Para un bloque de vertices se cuentan los vecinos de cada color, que es
+        el producto de la matriz de adyacencia por la codificacion one-hot de la
+        coloracion, y luego se multiplica por W.
+
+        Args:
+            colors (array): Indice del color de cada vertice.
+
+        Returns:
+            generator: Pares (inicio, tabla) con el indice del primer vertice
+                del bloque y su tabla de potenciales interferencias.
+        """
+        csr = self._csr_graph()
+        n, s_size = csr.n_vertices(), len(self._spectrum)
+        w = self._w_matrix()
+        block = max(1, TABLE_BLOCK_SIZE//s_size)
+        for start in range(0, n, block):
+            end = min(n, start + block)
+            first, last = csr.offsets[start], csr.offsets[end]
+            rows = self._edge_sources[first:last] - start
+            counts = np.bincount(rows*s_size + colors[csr.indices[first:last]],
+                minlength=(end - start)*s_size).reshape(end - start, s_size)
+            if isinstance(w, BandedW):
+                yield start, w.apply(counts)
+            else:
+                yield start, counts @ w.T
+
+    def potential_interference_table(self, c=None):
+        """Tabla de potenciales interferencias de una coloracion. La celda
+        (i, j) es la potencial interferencia del i-esimo vertice con el
+        j-esimo color del espectro.
+
+        Args:
+            c (dict): Coloracion del grafo, o su arreglo compacto. Por defecto es None.
+
+        Returns:
+            array: Tabla de |V| x |S| de potenciales interferencias.
+        """
+        colors = self._coloring_array(c)
+        return np.concatenate([table for _, table in self._potential_interference_blocks(colors)])
+
+    def best_response(self, c=None):
+        """Determina para cada vertice el color con la menor potencial
+        interferencia en la coloracion.
+
+        Args:
+            c (dict): Coloracion del grafo, o su arreglo compacto. Por defecto es None.
+
+        Returns:
+            dict: Mejor color para cada vertice.
+        """
+        colors = self._coloring_array(c)
+        best = np.concatenate([table.argmin(axis=1) for _, table in self._potential_interference_blocks(colors)])
+        spectrum = self._spectrum
+        return {v:spectrum[i] for v, i in zip(self._csr_graph().labels.tolist(), best.tolist())}
+
+    def unstable_vertices(self, c=None):
+        """Determina los vertices cuya interferencia actual es mayor que
+        alguna de sus potenciales interferencias en la coloracion.
+
+        Args:
+            c (dict): Coloracion del grafo, o su arreglo compacto. Por defecto es None.
+
+        Returns:
+            list: Lista de vertices inestables.
+        """
+        colors = self._coloring_array(c)
+        unstable = []
+        for start, table in self._potential_interference_blocks(colors):
+            current = table[np.arange(table.shape[0]), colors[start:start + table.shape[0]]]
+            unstable.append(np.flatnonzero(table.min(axis=1) < current) + start)
+        # un grafo sin vertices no tiene bloques ni vertices inestables
+        if not unstable:
+            return []
+        return self._csr_graph().labels[np.concatenate(unstable)].tolist()
 
     def threshold(self, c=None):
         """Determina el umbral de interferencia para una coloracion.
@@ -128,12 +440,12 @@ class SpectrumGraphColoring(object):
         vertices del grafo.
 
         Args:
-            c (dict): Coloracion del grafo. Por defecto es None.
+            c (dict): Coloracion del grafo, o su arreglo compacto. Por defecto es None.
 
         Returns:
             float: Umbral de interferencia.
         """        
-        return max([self.vertex_interference(v, c) for v in self.vertices()])
+        return float(self.interference_array(c).max())
 
     def tsc_upper_bound(self, k):
         """Determina la cota superior para el problema TSC.
@@ -159,9 +471,15 @@ class SpectrumGraphColoring(object):
         """        
         nnorm = self._natural_norm()
         Delta = self._graph.Delta()
-        # convertimos el diccionario 'self._w' en una lista con todos sus elementos
-        w = [self._w[i].values() for i in self._w]
-        w = [item for sublist in w for item in sublist]
+        if isinstance(self._w, BandedW):
+            # los valores distintos de la matriz son los de su perfil y el 0 fuera de la banda
+            w = self._w.profile.tolist() + [0.0]
+        elif isinstance(self._w, np.ndarray):
+            w = self._w.ravel().tolist()
+        else:
+            # convertimos el diccionario 'self._w' en una lista con todos sus elementos
+            w = [self._w[i].values() for i in self._w]
+            w = [item for sublist in w for item in sublist]
         # calculamos el maximo comun divisor de la lista (numeros no enteros)
         gcd_w = lgcd(w)
         # caso donde 't' es divisor del mcd
@@ -172,6 +490,52 @@ class SpectrumGraphColoring(object):
         else :
             return -( -(Delta*nnorm + gcd_w) // (gcd_w * (t//gcd_w) + gcd_w) )
 
+    def _greedy_clique(self, tries=10):
+        """Busca una clique del grafo de forma greedy. Se parte de cada uno
+        de los vertices de mayor grado y se agrega en cada paso el candidato
+        de mayor grado que sea adyacente a todos los vertices de la clique.
+
+        Args:
+            tries (int): Cantidad de vertices de partida. Por defecto es 10.
+
+        Returns:
+            list: Indices de los vertices de la mayor clique encontrada.
+        """
+        csr = self._csr_graph()
+        degrees = np.diff(csr.offsets)
+        best = []
+        for seed in np.argsort(-degrees, kind='stable')[:tries].tolist():
+            clique = [seed]
+            candidates = set(csr.neighbour_indices(seed).tolist())
+            candidates.discard(seed)
+            while candidates:
+                v = max(candidates, key=lambda u: (degrees[u], -u))
+                clique.append(v)
+                candidates.intersection_update(csr.neighbour_indices(v).tolist())
+            if len(clique) > len(best):
+                best = clique
+        return best
+
+    def csc_lower_bound(self, t):
+        """Determina una cota inferior para el problema CSC a partir de una
+        clique de q vertices. Con k colores algun color se repite en al menos
+        ceil(q/k) vertices de la clique, y cada uno de ellos recibe al menos
+        (ceil(q/k) - 1) veces el menor valor de la diagonal de W.
+
+        Args:
+            t (float): Umbral de interferencia permitido.
+
+        Returns:
+            int: Cota inferior para el numero de colores de CSC.
+        """
+        q = len(self._greedy_clique())
+        diagonal = float(self._w_matrix().diagonal().min()) if self._spectrum else 0
+        if q <= 1 or diagonal <= 0:
+            return 1
+        # mayor cantidad de vertices de la clique que pueden compartir un color
+        shared = int(t // diagonal) + 1
+        return max(1, -(-q // shared))
+
     def _natural_norm(self):
         """Calcula la norma natural de la matriz 'self._w'.
         Esta es la maxima de las sumas de sus filas.
@@ -179,9 +543,13 @@ class SpectrumGraphColoring(object):
         Returns:
             float: Norma natural de la matriz.
         """        
+        if isinstance(self._w, BandedW):
+            return float(self._w.row_sums().max())
+        rows = self._w.tolist() if isinstance(self._w, np.ndarray) else \
+            [self._w[i].values() for i in self._w]
         max_row_sum = 0
-        for i in self._w:
-            row_sum = sum(self._w[i].values())
+        for row in rows:
+            row_sum = sum(row)
             if row_sum > max_row_sum:
                 max_row_sum = row_sum
         return max_row_sum
@@ -204,6 +572,100 @@ class SpectrumGraphColoring(object):
             res += "-"
         return res
 
+    def components(self):
+        """Divide el grafo en sus componentes conexas.
+
+        Returns:
+            list: Subgrafos en formato CSR de cada componente conexa,
+                de mayor a menor cantidad de vertices.
+        """
+        csr = self._csr_graph()
+        n_components, labels = csr.connected_components()
+        if n_components == 0:
+            return []
+        # los vertices de cada componente quedan contiguos y en su orden original
+        order = np.argsort(labels, kind='stable')
+        sizes = np.bincount(labels, minlength=n_components)
+        groups = np.split(order, np.cumsum(sizes)[:-1])
+        groups.sort(key=len, reverse=True)
+        return [csr.subgraph(group) for group in groups]
+
+    def _solve_components(self, method, arg, processes=None):
+        """Ejecuta un metodo de la clase en cada componente conexa del grafo.
+        Las componentes se envian a un grupo de procesos de mayor a menor, y
+        cada una usa una semilla de 'random' tomada de la secuencia actual,
+        por lo que el resultado no depende de la cantidad de procesos. El
+        espectro y la matriz de interferencias se envian una sola vez a cada
+        proceso, con la matriz como arreglo para no convertirla en cada
+        componente.
+
+        Args:
+            method (str): Nombre del metodo a ejecutar.
+            arg: Argumento del metodo.
+            processes (int, opcional): Cantidad de procesos. Por defecto es
+                la cantidad de procesadores.
+
+        Returns:
+            list: Resultado del metodo en cada componente.
+        """
+        tasks = [(type(self), graph, method, arg, random.getrandbits(32))
+            for graph in self.components()]
+        problem = self._spectrum, self._w_matrix()
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = min(processes, len(tasks))
+        if processes <= 1:
+            return [_solve_component(task, problem) for task in tasks]
+        with ProcessPoolExecutor(processes, initializer=_init_component_worker,
+                initargs=problem) as executor:
+            return list(executor.map(_solve_component, tasks,
+                chunksize=max(1, len(tasks)//(4*processes))))
+
+    def ComponentThresholdSpectrumColoring(self, k, processes=None):
+        """Resuelve TSC de forma independiente en cada componente conexa del
+        grafo. El umbral de la coloracion es el maximo de los umbrales de
+        las componentes.
+
+        Args:
+            k (int): Numero de colores permitidos.
+            processes (int, opcional): Cantidad de procesos. Por defecto es
+                la cantidad de procesadores.
+
+        Returns:
+            float, dict: Minimo umbral k-cromatico, coloracion
+                del grafo que cumple las restricciones.
+        """
+        results = self._solve_components('ThresholdSpectrumColoring', k, processes)
+        coloring = {}
+        for _, c in results:
+            coloring.update(c)
+        # un grafo sin componentes tiene umbral 0
+        return max((t for t, _ in results), default=0), {v:coloring[v] for v in self.vertices()}
+
+    def ComponentChromaticSpectrumColoring(self, t, processes=None):
+        """Resuelve CSC de forma independiente en cada componente conexa del
+        grafo. Como los colores se toman en el orden del espectro, el numero
+        de colores del grafo es el maximo de los de las componentes.
+
+        Args:
+            t (float): Umbral de interferencia permitido.
+            processes (int, opcional): Cantidad de procesos. Por defecto es
+                la cantidad de procesadores.
+
+        Returns:
+            int, dict: Numero cromatico de t-interferencia, coloracion
+                del grafo que cumple las restricciones.
+        """
+        results = self._solve_components('ChromaticSpectrumColoring', t, processes)
+        coloring = {}
+        for _, c in results:
+            coloring.update(c)
+        # si alguna componente no cumple el umbral tampoco lo cumple el grafo
+        if any(coloring.get(v) is None for v in self.vertices()):
+            return len(self.vertices()), {v:None for v in self.vertices()}
+        # un grafo sin componentes no usa colores
+        return max((k for k, _ in results), default=0), {v:coloring[v] for v in self.vertices()}
+
     def ThresholdSpectrumColoring(self, k):
         """Metodo abstracto del problema TSC.
 
@@ -216,6 +678,34 @@ class SpectrumGraphColoring(object):
         """        
         return None
 
+    def ThresholdSpectrumSweep(self, k_values):
+        """Resuelve TSC para varios numeros de colores. Por defecto se
+        resuelve TSC de forma independiente para cada uno.
+
+        Args:
+            k_values (list): Numeros de colores permitidos.
+
+        Returns:
+            dict: Umbral y coloracion obtenidos para cada numero de colores.
+        """
+        return {k:self.ThresholdSpectrumColoring(k) for k in k_values}
+
+    def ThresholdSpectrumDecision(self, k, t):
+        """Determina si se encuentra una k-coloracion con umbral a lo sumo
+        't'. Por defecto se resuelve TSC y se compara su umbral, usando
+        la cache de resultados si la clase tiene una.
+
+        Args:
+            k (int): Numero de colores permitidos.
+            t (float): Umbral de interferencia permitido.
+
+        Returns:
+            bool, dict: True si la coloracion cumple el umbral, y la coloracion
+                del grafo, que puede ser None si no lo cumple.
+        """
+        t0, coloring = self.CachedThresholdSpectrumColoring(k)
+        return t0 <= t, coloring
+
     def ChromaticSpectrumColoring(self, t):
         """Metodo abstracto del problema CSC.
 
@@ -0,0 +1,125 @@
+""" Python Class
+    Clase de Python que mantiene la interferencia de cada vertice en
+    una coloracion y su umbral mientras se recolorean los vertices.
+    Las interferencias se guardan en las hojas de un arbol de segmentos
+    de maximos, por lo que recolorear un vertice solo actualiza al vertice,
+    a sus vecinos y a sus ancestros en el arbol, y el umbral siempre se
+    encuentra en la raiz.
+"""
+
+import numpy as np
+
+
+class InterferenceTracker(object):
+
+    def __init__(self, graph, w, colors):
+        """Inicializa un objeto InterferenceTracker a partir de una coloracion.
+
+        Args:
+            graph (CSRGraph): Grafo en formato CSR.
+            w (array): Matriz de |S| x |S| de interferencias entre los colores.
+            colors (array): Indice del color de cada vertice.
+        """
+        self._graph = graph
+        self._w = w
+        self._colors = np.array(colors, dtype=np.intp)
+        n = graph.n_vertices()
+        sources = np.repeat(np.arange(n), np.diff(graph.offsets))
+        values = w[self._colors[sources], self._colors[graph.indices]]
+        self._interference = np.bincount(sources, weights=values, minlength=n)
+        # arbol de segmentos con las hojas en [size, size + n), el nodo i
+        # guarda el maximo de sus hijos 2i y 2i + 1
+        self._size = 2
+        while self._size < n:
+            self._size *= 2
+        self._tree = np.full(2*self._size, -np.inf)
+        self._tree[self._size:self._size + n] = self._interference
+        level = self._size
+        while level > 1:
+            level //= 2
+            nodes = np.arange(level, 2*level)
+            self._tree[nodes] = np.maximum(self._tree[2*nodes], self._tree[2*nodes + 1])
+
+    @property
+    def threshold(self):
+        """Umbral de interferencia de la coloracion actual."""
+        return float(self._tree[1])
+
+    @property
+    def colors(self):
+        """Indice del color de cada vertice, no debe modificarse."""
+        return self._colors
+
+    def interference(self, i):
+        """Interferencia del vertice con indice 'i'.
+
+        Args:
+            i (int): Indice del vertice.
+
+        Returns:
+            float: Interferencia del vertice.
+        """
+        return float(self._interference[i])
+
+    def _update(self, vertices):
+        """Actualiza las hojas de los vertices dados y sus ancestros en el arbol.
+
+        Args:
+            vertices (array): Indices de los vertices modificados.
+        """
+        nodes = vertices + self._size
+        self._tree[nodes] = self._interference[vertices]
+        while True:
+            nodes = np.unique(nodes >> 1)
+            self._tree[nodes] = np.maximum(self._tree[2*nodes], self._tree[2*nodes + 1])
+            if nodes[0] == 1:
+                break
+
+    def recolor(self, i, color):
+        """Asigna un nuevo color al vertice con indice 'i' y actualiza las
+        interferencias del vertice y de sus vecinos en O(deg log n).
+
+        Args:
+            i (int): Indice del vertice.
+            color (int): Indice del nuevo color.
+
+        Returns:
+            float: Umbral de interferencia de la nueva coloracion.
+        """
+        old = self._colors[i]
+        if old == color:
+            return self.threshold
+        neighbours = self._graph.neighbour_indices(i)
+        neighbour_colors = self._colors[neighbours]
+        # cada vecino cambia el termino W[c(u), old] por W[c(u), color]
+        np.add.at(self._interference, neighbours,
+            self._w[neighbour_colors, color] - self._w[neighbour_colors, old])
+        self._colors[i] = color
+        # la interferencia del vertice se calcula de nuevo
+        self._interference[i] = self._w[color, self._colors[neighbours]].sum()
+        self._update(np.append(neighbours, i))
+        return self.threshold
+
+    def probe(self, i, color):
+        """Determina el umbral que se obtendria al asignar un nuevo color al
+        vertice con indice 'i', sin modificar la coloracion. Los valores
+        se restauran exactamente, por lo que no se acumulan errores de
+        redondeo al probar muchos movimientos.
+
+        Args:
+            i (int): Indice del vertice.
+            color (int): Indice del nuevo color.
+
+        Returns:
+            float: Umbral de interferencia con el nuevo color.
+        """
+        old = self._colors[i]
+        if old == color:
+            return self.threshold
+        affected = np.append(self._graph.neighbour_indices(i), i)
+        saved = self._interference[affected]
+        threshold = self.recolor(i, color)
+        self._colors[i] = old
+        self._interference[affected] = saved
+        self._update(affected)
+        return threshold
@@ -0,0 +1,156 @@
+""" Python Class
+    Cache de los resultados de TSC. Cada resultado se identifica por
+    un hash del contenido de la instancia (grafo, espectro y matriz W)
+    junto con el algoritmo, sus parametros y la semilla usada, por lo
+    que dos objetos distintos con la misma instancia comparten sus
+    resultados. Los resultados se guardan en memoria con una politica
+    LRU y, de forma opcional, en un directorio para reutilizarlos entre
+    ejecuciones.
+"""
+
+import os
+import pickle
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from code.csr_graph import CSRGraph
+from code.banded_w import BandedW
+
+
+def instance_fingerprint(graph, spectrum, w):
+    """Hash del contenido de una instancia de TSC o CSC.
+
+    Args:
+        graph (Graph): Grafo de la instancia.
+        spectrum (list): Espectro de colores.
+        w (dict): Matriz de interferencias entre los colores, un arreglo de
+            |S| x |S| con las filas y columnas en el orden del espectro, o una
+            matriz de banda BandedW.
+
+    Returns:
+        str: Hash SHA-1 de la instancia.
+    """
+    csr = CSRGraph.from_graph(graph)
+    sha1 = hashlib.sha1()
+    sha1.update(np.ascontiguousarray(csr.offsets, dtype=np.int64).tobytes())
+    sha1.update(np.ascontiguousarray(csr.indices, dtype=np.int32).tobytes())
+    sha1.update(repr(csr.vertices()).encode())
+    sha1.update(repr(list(spectrum)).encode())
+    if isinstance(w, BandedW):
+        # la matriz de banda queda determinada por su perfil
+        sha1.update(b'banded')
+        w = w.profile
+    elif isinstance(w, dict):
+        w = [[w[c1][c2] for c2 in spectrum] for c1 in spectrum]
+    sha1.update(np.ascontiguousarray(w, dtype=np.float64).tobytes())
+    return sha1.hexdigest()
+
+
+class ResultCache(object):
+
+    def __init__(self, max_size=256, path=None):
+        """Inicializa un objeto ResultCache.
+
+        Args:
+            max_size (int): Maxima cantidad de resultados en memoria. Por defecto es 256.
+            path (str, opcional): Directorio donde se guardan los resultados. Por
+                defecto es None, y los resultados solo se guardan en memoria.
+        """
+        self._max_size = max_size
+        self._path = path
+        self._memory = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @staticmethod
+    def key(*params):
+        """Clave de un resultado a partir de sus parametros.
+
+        Args:
+            params: Hash de la instancia, algoritmo y parametros del problema.
+
+        Returns:
+            str: Clave del resultado.
+        """
+        return hashlib.sha1(repr(params).encode()).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self._path, key + '.pkl')
+
+    def get(self, key):
+        """Busca un resultado en memoria y luego en disco.
+
+        Args:
+            key (str): Clave del resultado.
+
+        Returns:
+            Resultado guardado, o None si no existe.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._hits += 1
+            return self._memory[key]
+        if self._path is not None and os.path.isfile(self._file(key)):
+            try:
+                with open(self._file(key), 'rb') as handle:
+                    value = pickle.load(handle)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self._hits += 1
+                return value
+        self._misses += 1
+        return None
+
+    def _remember(self, key, value):
+        """Guarda un resultado en memoria, eliminando el menos usado si
+        se supera la capacidad."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_size:
+            self._memory.popitem(last=False)
+
+    def put(self, key, value):
+        """Guarda un resultado en memoria y en disco si corresponde. El
+        fichero se escribe con un nombre temporal y luego se renombra.
+
+        Args:
+            key (str): Clave del resultado.
+            value: Resultado.
+        """
+        self._remember(key, value)
+        if self._path is None:
+            return
+        tmp_path = '{}.{}.tmp'.format(self._file(key), os.getpid())
+        try:
+            with open(tmp_path, 'wb') as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._file(key))
+        except OSError:
+            # si no se puede escribir en disco el resultado queda solo en memoria
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def stats(self):
+        """Estadisticas de uso de la cache.
+
+        Returns:
+            dict: Aciertos, fallos y cantidad de resultados en memoria.
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'size': len(self._memory)}
+
+    def clear(self):
+        """Elimina los resultados en memoria y reinicia los contadores."""
+        self._memory.clear()
+        self._hits = self._misses = 0
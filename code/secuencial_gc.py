@@ -9,11 +9,46 @@
 """
 
 import random
+import numpy as np
 from code.graph_coloring import SpectrumGraphColoring
+from code.color_counts import ColorCounts
+
+# tolerancia relativa al comparar una interferencia parcial con el umbral,
+# para no detener una coloracion por errores de redondeo
+DECISION_TOLERANCE = 1e-9
+
+# tolerancia relativa con la que dos potenciales interferencias se
+# consideran iguales al elegir el color de un vertice
+TIE_TOLERANCE = 1e-9
+
+
+def _first_min(row):
+    """Indice del primer valor minimo de la fila. Los valores que solo
+    difieren del minimo por errores de redondeo se consideran empatados,
+    y el empate lo gana el de menor indice.
+
+    Args:
+        row (array): Potenciales interferencias de un vertice.
+
+    Returns:
+        int: Indice del primer valor minimo.
+    """
+    low = row.min()
+    return int(np.flatnonzero(row <= low + TIE_TOLERANCE*max(1.0, abs(low)))[0])
+
+
+class _ThresholdExceeded(Exception):
+    """Se lanza cuando una interferencia parcial supera el umbral en el
+    modo de decision."""
+    pass
 
 
 class SecuencialGraphColoring(SpectrumGraphColoring):
 
+    # se puede detener la coloracion en el modo de decision, las clases que
+    # mejoran la coloracion despues de crearla deben desactivarlo
+    _early_abort = True
+
     def __init__(self, graph, spectrum, w):
         """Inicializa un objeto SecuecialGraphColoring usando
         un grafo, un espectro de colores y una matriz de interferencias.
@@ -27,12 +62,20 @@ class SecuencialGraphColoring(SpectrumGraphColoring):
         super().__init__(graph, spectrum, w)
         # guardamos los grados de los vertices para optimizar en su consulta
         self._vertex_degree = {v:len(graph.neighbours(v)) for v in self.vertices()}
-        # diccionario que almacenara la interferencia de cada color para
-        # cada vertice en tiempo real de forma dinamica
-        self._color_interference = {}
+        # cantidad de vecinos de cada vertice con cada color, de la que se
+        # obtiene la potencial interferencia de cada color para cada vertice
+        self._color_counts = None
+        # indice del color de cada vertice en la coloracion parcial, -1 si
+        # el vertice aun no se colorea, es el arreglo de 'self._color_counts'
+        self._vertex_color = None
         # orden en que los vertices son visitados para su
         # posterior coloracion mediante un algoritmo greedy
         self._vertex_order = []
+        # umbral del modo de decision, None si se resuelve TSC completo
+        self._decision_threshold = None
+        # interferencia de cada vertice coloreado con los vecinos coloreados
+        # hasta el momento, solo se usa en el modo de decision
+        self._partial_interference = None
 
     def _max_vdegree(self, vertices):
         """Determina el vertice de mayor grado. En caso de haber mas de uno,
@@ -57,30 +100,61 @@ class SecuencialGraphColoring(SpectrumGraphColoring):
 
     def _min_semi_interference(self, vertex, semi_coloring, spectrum):
         """Determina el color con la menor potencial interferencia para
-        el vertice en una coloracion parcial del grafo.
+        el vertice en una coloracion parcial del grafo. En caso de empate,
+        salvo errores de redondeo, se toma el primero de ellos en el espectro.
 
         Args:
             vertex : Vertice del grafo.
             semi_coloring (dict): Coloracion parcial de los vertices del grafo.
-            spectrum (list): Espectro de colores.
+            spectrum (list): Espectro de colores, los primeros colores de 'self._spectrum'.
 
         Returns:
             Color con la menor potencial interferencia.
         """        
-        # mejor color
-        best_c = None
-        # mejor valor
-        best = 1e10
-        for c in spectrum:
-            if self._color_interference[vertex][c] < best:
-                best = self._color_interference[vertex][c]
-                best_c = c
-        return best_c
+        i = self._csr.index(vertex)
+        row = self._potential_row(i, len(spectrum))
+        # la fila incluye el primer color sin interferencia con los colores
+        # usados, y los siguientes colores tambien tienen interferencia 0
+        return spectrum[_first_min(row)]
+
+    def _potential_row(self, i, k, color_counts=None):
+        """Potencial interferencia del vertice con indice 'i' con los primeros
+        'k' colores, calculada a partir de los conteos de colores de sus vecinos.
+        Solo se calculan los colores hasta el primero que no interfiere con
+        ningun color usado, ya que los siguientes tambien tienen interferencia 0.
+
+        Args:
+            i (int): Indice del vertice.
+            k (int): Numero de colores.
+            color_counts (ColorCounts): Conteos de colores de los vecinos. Por
+                defecto son los de la coloracion actual.
+
+        Returns:
+            array: Potencial interferencia con cada color, de a lo sumo k elementos.
+        """
+        if color_counts is None:
+            color_counts = self._color_counts
+        reach = color_counts.n_colors + self._w_bandwidth() + 1
+        return color_counts.potential(i, self._w_matrix(), min(k, reach))
+
+    def _interference_at(self, i, j):
+        """Potencial interferencia del vertice con indice 'i' con el color
+        de indice 'j'.
+
+        Args:
+            i (int): Indice del vertice.
+            j (int): Indice del color.
+
+        Returns:
+            float: Potencial interferencia.
+        """
+        return self._color_counts.potential_at(i, self._w_matrix(), j)
 
     def _update_values(self, vertex, color, semi_coloring, aupdate=False, update_color=False):
-        """Actualiza la potencial interferencia para los vecinos de 'vertex'
-        como resultado de asignarle el color 'color'. Este metodo no asigna
-        directamente el color al vertice, y debe de ser llamado antes de dicha
+        """Actualiza los conteos de colores de los vecinos de 'vertex' como
+        resultado de asignarle el color 'color', de los que se obtiene su
+        potencial interferencia. Este metodo no asigna directamente el color
+        al vertice en la coloracion, y debe de ser llamado antes de dicha
         asignacion.
 
         Args:
@@ -89,25 +163,113 @@ class SecuencialGraphColoring(SpectrumGraphColoring):
             semi_coloring (dict): Coloracion parcial de los vertices del grafo.
             aupdate (bool): Si es True si se actualizaran los valores de todos
                 los vecinos de 'vertex', en otro caso solo los que aun no se 
-                colorean. Por defecto es False.
+                colorean. Los conteos siempre se actualizan para todos los
+                vecinos, por lo que solo lo usan las clases hijas. Por defecto
+                es False.
             update_color (bool): Si es True representa que 'vertex' tenia un color
                 previo en la coloracion y se actualizara con uno nuevo. Por defecto 
                 es False.
         """        
-        # actualizamos la potencial interferencia para cada vertice del grafo
-        for u in self._graph.neighbours(vertex):
-            if semi_coloring[u] is None or aupdate:
-                # actualizamos la potencial interferencia para cada color
-                for c in self._spectrum:
-                    self._color_interference[u][c] += self._w[color][c]
-                    # en caso que 'vertex' tuviera un color previo, tenemos
-                    # que restar su valor tambien
-                    if update_color is True:
-                        self._color_interference[u][c] -= self._w[semi_coloring[vertex]][c]
+        i = self._csr.index(vertex)
+        color = self._color_index[color]
+        # si el vertice tenia un color previo, se descuenta antes de
+        # contar el nuevo, con enteros y sin errores de redondeo
+        self._color_counts.assign(i, color)
+        if self._decision_threshold is not None and update_color is False:
+            self._check_partial_interference(i, color)
+
+    def _check_partial_interference(self, i, color):
+        """Actualiza la interferencia parcial del vertice recien coloreado y
+        de sus vecinos coloreados, y detiene la coloracion si alguna supera
+        el umbral del modo de decision. Como las interferencias solo crecen
+        al colorear mas vertices, la coloracion final tampoco lo cumpliria.
+
+        Args:
+            i (int): Indice del vertice coloreado.
+            color (int): Indice de su color.
+        """
+        neighbours = self._csr.neighbour_indices(i)
+        colored = neighbours[self._vertex_color[neighbours] >= 0]
+        colored = colored[colored != i]
+        np.add.at(self._partial_interference, colored, self._w_matrix()[self._vertex_color[colored], color])
+        self._partial_interference[i] = self._interference_at(i, color)
+        t = self._decision_threshold
+        limit = t + DECISION_TOLERANCE*max(1.0, abs(t))
+        if self._partial_interference[i] > limit or \
+                (colored.shape[0] and self._partial_interference[colored].max() > limit):
+            raise _ThresholdExceeded()
+
+    def _sweep_order(self):
+        """Orden de coloracion de los vertices, si no depende de los colores
+        asignados ni del numero de colores.
+
+        Returns:
+            list: Vertices en el orden de coloracion, o None si el orden
+                depende de la coloracion.
+        """
+        return None
+
+    def ThresholdSpectrumSweep(self, k_values):
+        """Resuelve TSC para varios numeros de colores. Si el orden de
+        coloracion no depende de la coloracion, se calcula una sola vez
+        y se colorean los vertices para todos los numeros de colores en
+        un mismo recorrido, con un conteo de colores de los vecinos por
+        cada numero de colores. La potencial interferencia se obtiene de
+        los conteos igual que en 'ThresholdSpectrumColoring(k)', por lo
+        que el resultado para cada k es el mismo usando el mismo orden.
+
+        Args:
+            k_values (list): Numeros de colores permitidos.
+
+        Returns:
+            dict: Umbral y coloracion obtenidos para cada numero de colores.
+        """
+        k_values = list(k_values)
+        order = self._sweep_order()
+        if order is None or not k_values:
+            return super().ThresholdSpectrumSweep(k_values)
+        csr = self._csr_graph()
+        # cantidad de vecinos de cada vertice con cada color para cada k
+        states = [ColorCounts(csr, len(self._spectrum)) for _ in k_values]
+        self._vertex_order = order
+        for vertex in order:
+            i = csr.index(vertex)
+            for k, color_counts in zip(k_values, states):
+                # el color de menor potencial interferencia con k colores
+                row = self._potential_row(i, k, color_counts)
+                color_counts.assign(i, _first_min(row))
+        result = {}
+        for k, color_counts in zip(k_values, states):
+            result[k] = self.threshold(color_counts.colors), self.labelled_coloring(color_counts.colors)
+        return result
+
+    def ThresholdSpectrumDecision(self, k, t):
+        """Determina si se encuentra una k-coloracion con umbral a lo sumo
+        't'. La coloracion se detiene en cuanto la interferencia parcial de
+        algun vertice supera 't'. Si la clase usa una cache de resultados
+        se resuelve TSC completo, ya que su resultado sirve para cualquier 't'.
+
+        Args:
+            k (int): Numero de colores permitidos.
+            t (float): Umbral de interferencia permitido.
+
+        Returns:
+            bool, dict: True si la coloracion cumple el umbral, y la coloracion
+                del grafo, que es None si se detuvo antes de terminar.
+        """
+        if not self._early_abort or self._cache is not None:
+            return super().ThresholdSpectrumDecision(k, t)
+        self._decision_threshold = t
+        try:
+            return super().ThresholdSpectrumDecision(k, t)
+        except _ThresholdExceeded:
+            return False, None
+        finally:
+            self._decision_threshold = None
 
     def _semi_interference(self, vertex, semi_coloring):
         """Determina manualmente la potencial interferencia del vertice
-        sin hacer uso de la memoria 'self._color_interference'.
+        sin hacer uso de la memoria 'self._color_counts'.
 
         Args:
             vertex : Vertice del grafo.
@@ -116,11 +278,13 @@ class SecuencialGraphColoring(SpectrumGraphColoring):
         Returns:
             float: Potencial interferencia del vertice.
         """        
+        # ignoramos los vertices que aun no han sido coloreados
+        colors = [self._color_index[semi_coloring[v]] for v in self._graph.neighbours(vertex) if semi_coloring[v]]
+        values = self._w_matrix()[self._color_index[semi_coloring[vertex]], np.array(colors, dtype=np.intp)]
         interference = 0
-        for v in self._graph.neighbours(vertex):
-            # ignoramos los vertices que aun no han sido coloreados
-            if semi_coloring[v]:
-                interference += self._w[semi_coloring[vertex]][semi_coloring[v]]
+        # sumamos en el orden de los vecinos
+        for value in values.tolist():
+            interference += value
         return interference
 
     def _new_coloring(self):
@@ -130,7 +294,18 @@ class SecuencialGraphColoring(SpectrumGraphColoring):
         Returns:
             dict: Nueva coloracion vacia de los vertices del grafo.
         """        
-        # ponemos en cero las potenciales interferencias
-        self._color_interference = {v:{c:0 for c in self._spectrum} for v in self.vertices()}
+        n = self._csr_graph().n_vertices()
+        # ponemos en cero los conteos de colores, la tabla se extiende a
+        # medida que se usan colores mayores y se reutiliza entre coloraciones
+        if self._color_counts is None:
+            self._color_counts = ColorCounts(self._csr_graph(), len(self._spectrum))
+        else:
+            self._color_counts.reset()
+        self._vertex_color = self._color_counts.colors
         self._vertex_order = []
-        return {v:None for v in self.vertices()}
\ No newline at end of file
+        if self._decision_threshold is not None:
+            if self._partial_interference is None:
+                self._partial_interference = np.zeros(n)
+            else:
+                self._partial_interference.fill(0)
+        return dict.fromkeys(self.vertices())
\ No newline at end of file
@@ -9,10 +9,28 @@
 import random
 from code.graph2 import Graph
 from code.secuencial_gc import SecuencialGraphColoring
+from code.interference_tracker import InterferenceTracker
 
 
 class SimpleSearch(SecuencialGraphColoring):
 
+    # la busqueda puede reducir el umbral de una coloracion que lo supera,
+    # por lo que no se detiene la coloracion inicial en el modo de decision
+    _early_abort = False
+
+    def ThresholdSpectrumSweep(self, k_values):
+        """Resuelve TSC para varios numeros de colores. La busqueda necesita
+        la memoria de potenciales interferencias de cada coloracion, por lo
+        que cada k se resuelve de forma independiente.
+
+        Args:
+            k_values (list): Numeros de colores permitidos.
+
+        Returns:
+            dict: Umbral y coloracion obtenidos para cada numero de colores.
+        """
+        return {k:self.ThresholdSpectrumColoring(k) for k in k_values}
+
     def simple_search(self, coloring, spectrum, max_iters=20, subset_size=0):
         """Optimiza el umbral de interferencia k-cromatico obtenido en la
         coloracion mediante la minimizacion de la interferencia en los
@@ -36,8 +54,10 @@ class SimpleSearch(SecuencialGraphColoring):
         if subset_size is 0:
             subset_size = int(len(self.vertices())/3)
         iters = 0
+        # mantenemos las interferencias de la coloracion de forma incremental
+        tracker = InterferenceTracker(self._csr_graph(), self._w_matrix(), self._coloring_array(coloring))
         # mejor valor del umbral
-        best = self.threshold(coloring)
+        best = tracker.threshold
         while iters < max_iters:
             # creamos un subconjunto de dimension subset_size
             for v in random.sample(self.vertices(), subset_size):
@@ -47,17 +67,16 @@ class SimpleSearch(SecuencialGraphColoring):
                 # si el color tomado es el mismo que tiene el vertice, continuamos
                 if c == v_color:
                     continue
-                # asignamos el color al vertice                
-                coloring[v] = c
-                # calculamos el umbral de la nueva coloracion
-                t = self.threshold(coloring)
-                coloring[v] = v_color
+                # calculamos el umbral de la coloracion con el nuevo color
+                # actualizando solo el vertice y sus vecinos
+                t = tracker.probe(self._csr.index(v), self._color_index[c])
                 # si obtenemos un menor umbral con la nueva coloracion,
                 # actualizamos los valores de las memorias y del mejor umbral
                 if t < best:
                     best = t
                     self._update_values(v,c, coloring, True, True)
                     coloring[v] = c
+                    tracker.recolor(self._csr.index(v), self._color_index[c])
                     break
             iters+=1
         return self.threshold(coloring), coloring
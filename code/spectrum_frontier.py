@@ -0,0 +1,146 @@
+""" Python Class
+    Clase de Python que calcula una sola vez la frontera entre el numero
+    de colores k y el umbral de interferencia de un grafo, usando algun
+    metodo de TSC, y responde consultas de TSC y CSC sobre ella.
+
+    Una coloracion con k colores usa los primeros k colores del espectro,
+    por lo que tambien es una coloracion valida con mas colores. Asi, el
+    mejor umbral encontrado con a lo sumo k colores no crece con k, y el
+    menor k que cumple un umbral t se encuentra mediante una Busqueda
+    Binaria en esta tabla. La tabla se extiende a mas colores solo cuando
+    una consulta lo necesita.
+"""
+
+import numpy as np
+from code.graph2 import Graph
+from code.vertex_merge import VertexMergeGraphColoring
+
+# maxima cantidad de celdas de las tablas de conteos de colores
+# que se usan al colorear varios k a la vez
+SWEEP_BLOCK_SIZE = 1 << 23
+
+
+class SpectrumFrontier(object):
+
+    def __init__(self, solver, k_max=16):
+        """Inicializa un objeto SpectrumFrontier.
+
+        Args:
+            solver (SpectrumGraphColoring): Metodo de TSC con el grafo, el
+                espectro y la matriz de interferencias.
+            k_max (int): Numero de colores hasta el que se calcula la frontera
+                inicialmente. Por defecto es 16.
+        """
+        self._solver = solver
+        self._s_size = len(solver._spectrum)
+        # mejor umbral con a lo sumo k colores en la posicion k - 1, y el
+        # numero de colores de la coloracion que lo alcanza
+        self._best = np.zeros(0)
+        self._best_k = []
+        # coloracion obtenida con cada numero de colores
+        self._colorings = {}
+        self.extend(k_max)
+
+    @property
+    def k_max(self):
+        """Numero de colores hasta el que se conoce la frontera."""
+        return self._best.shape[0]
+
+    def extend(self, k_max):
+        """Extiende la frontera hasta 'k_max' colores. Los valores de k se
+        resuelven por bloques con 'ThresholdSpectrumSweep', de forma que las
+        tablas de cada bloque no superen SWEEP_BLOCK_SIZE celdas.
+
+        Args:
+            k_max (int): Nuevo numero maximo de colores.
+        """
+        k_max = min(k_max, self._s_size)
+        n = max(1, len(self._solver.vertices()))
+        k = self.k_max + 1
+        while k <= k_max:
+            size = max(1, min(k_max - k + 1, SWEEP_BLOCK_SIZE//(n*k_max)))
+            results = self._solver.ThresholdSpectrumSweep(range(k, k + size))
+            best = list(self._best)
+            for k0 in range(k, k + size):
+                t, coloring = results[k0]
+                self._colorings[k0] = coloring
+                # la mejor coloracion con a lo sumo k0 colores
+                if best and best[-1] <= t:
+                    best.append(best[-1])
+                    self._best_k.append(self._best_k[-1])
+                else:
+                    best.append(t)
+                    self._best_k.append(k0)
+            self._best = np.array(best)
+            k += size
+
+    def threshold(self, k):
+        """Menor umbral encontrado con a lo sumo k colores (TSC).
+
+        Args:
+            k (int): Numero de colores permitidos.
+
+        Returns:
+            float, dict: Umbral de interferencia y coloracion que lo alcanza.
+        """
+        k = min(k, self._s_size)
+        if k > self.k_max:
+            self.extend(k)
+        k0 = self._best_k[k - 1]
+        return float(self._best[k - 1]), self._colorings[k0]
+
+    def chromatic(self, t):
+        """Menor numero de colores que cumple el umbral t (CSC). Si la frontera
+        no lo alcanza, se duplica el numero de colores hasta llegar al espectro.
+
+        Args:
+            t (float): Umbral de interferencia permitido.
+
+        Returns:
+            int, dict: Numero cromatico de t-interferencia, coloracion
+                del grafo que cumple las restricciones.
+        """
+        while self._best[-1] > t and self.k_max < self._s_size:
+            self.extend(2*self.k_max)
+        if self._best[-1] > t:
+            vertices = self._solver.vertices()
+            return len(vertices), {v:None for v in vertices}
+        # el umbral no crece con k, buscamos la primera posicion que lo cumple
+        index = int(np.searchsorted(-self._best, -t, side='left'))
+        k = self._best_k[index]
+        return k, self._colorings[k]
+
+    def points(self):
+        """Puntos de la frontera de Pareto: cada numero de colores en que el
+        umbral mejora, con su umbral.
+
+        Returns:
+            list: Pares (k, umbral).
+        """
+        return [(k, self._best[k - 1].item()) for k in sorted(set(self._best_k))]
+
+
+if __name__ == "__main__":
+
+
+    g = {
+        "a": ["b", "c"],
+        "b": ["a", "c"],
+        "c": ["a", "b", "d"],
+        "d": ["c"]
+    }
+    graph = Graph(g)
+    S = ["1", "2", "3", "4"]
+    W = {
+        "1": {"1": 1, "2": .5, "3": .25, "4":.125},
+        "2": {"1": .5, "2": 1, "3": .5, "4": .25},
+        "3": {"1": .25, "2": .5, "3": 1, "4": .5},
+        "4": {"1": .125, "2": .25, "3": .5, "4": 1}
+    }
+    frontier = SpectrumFrontier(VertexMergeGraphColoring(graph, S, W))
+
+    print('Pareto frontier (k, threshold):')
+    print(frontier.points())
+    for t0 in [0.5, 1.0, 2.0]:
+        print(f'Best value and coloring for the CSC problem and t = {t0}:')
+        print(frontier.chromatic(t0))
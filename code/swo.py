@@ -10,6 +10,12 @@
     provocando que al reordenar los vertices para la 
     proxima iteracion, estos sean visitados mas tempranamente. 
     La ordenacion inicial es aleatoria.
+
+    Al reordenar los vertices suele mantenerse un prefijo del orden
+    anterior, y como la coloracion greedy de un prefijo solo depende
+    de el, cada iteracion deshace la coloracion anterior desde la
+    primera posicion en que cambia el orden y solo colorea de nuevo
+    el resto de los vertices.
 """
 
 import random
@@ -34,6 +40,40 @@ class SWOGraphColoring(SecuencialGraphColoring, CSCBinarySearch):
             float, dict: Minimo umbral k-cromatico, coloracion
                 del grafo que cumple las restricciones.
         """        
+        return self._search(k)
+
+    def ThresholdSpectrumDecision(self, k, t):
+        """Determina si se encuentra una k-coloracion con umbral a lo sumo
+        't'. Cada iteracion necesita la coloracion completa para asignar
+        la culpa, por lo que no se detienen las coloraciones, sino las
+        iteraciones de SWO en cuanto una coloracion cumple el umbral.
+
+        Args:
+            k (int): Numero de colores permitidos.
+            t (float): Umbral de interferencia permitido.
+
+        Returns:
+            bool, dict: True si la coloracion cumple el umbral, y la coloracion
+                del grafo.
+        """
+        # las clases que mejoran la coloracion de SWO necesitan el resultado
+        # completo, al igual que la cache de resultados
+        if not self._early_abort or self._cache is not None:
+            return super().ThresholdSpectrumDecision(k, t)
+        t0, coloring = self._search(k, t)
+        return t0 <= t, coloring
+
+    def _search(self, k, stop=None):
+        """Busqueda de SWO con k colores.
+
+        Args:
+            k (int): Numero de colores permitidos.
+            stop (float, opcional): Se detiene la busqueda al encontrar una
+                coloracion con umbral a lo sumo 'stop'. Por defecto es None.
+
+        Returns:
+            float, dict: Menor umbral encontrado y su coloracion.
+        """
         # reducimos el numero de colores del espectro a k
         spectrum = self._spectrum[:k]
         # creamos una copia de los vertices del grafo y
@@ -49,53 +89,83 @@ class SWOGraphColoring(SecuencialGraphColoring, CSCBinarySearch):
         vertex_order = [[v, n_vertices - i] for i, v in enumerate(vertex_order)]
         solution = None
         best = 1e10
+        # orden y coloracion de la iteracion anterior
+        order = None
+        coloring = None
         # parametro de SWO para representa el margen de culpabilidad
         a = 0.8
         # parametro de SWO que representa el valor de penalizacion en caso de culpa
         b = n_vertices/5
         while iters < max_iters:
             # coloreamos los vertices en el orden de 'vertex_order' de forma greedy
-            coloring = self._coloring(vertex_order, spectrum)
-            # calculamos el umbral de la coloracion
-            t = self.threshold(coloring)
-            # si el umbral mejora el mejor valor obtenido, se actualiza con los nuevos valores
+            # a partir de la coloracion anterior
+            coloring, order = self._coloring(vertex_order, spectrum, order, coloring)
+            # calculamos el umbral de la coloracion con el arreglo de colores de la memoria
+            colors = self._vertex_color
+            t = self.threshold(colors)
+            # si el umbral mejora el mejor valor obtenido, se actualiza con los nuevos valores,
+            # guardando una copia compacta ya que la coloracion se modifica en la siguiente iteracion
             if t < best:
                 best = t
-                solution = coloring
+                solution = colors.copy()
+            if stop is not None and best <= stop:
+                break
             # recorremos cada vertice del grafo asignandoles una prioridad que corresponda con su orden
             # en 'vertex_order' (los primeros vertices tendran la mayor prioridad) y le sumamos un valor 
             # de culpa a aquellos vertices que tengan una interferencia mayor o igual al margen de culpa
             # 'a*t', para que asi sean visitados mas tempranamente al reordenar 'vertex_order'
             for i, v in enumerate(vertex_order):
                 v[1] = n_vertices-i
-                if self._color_interference[v[0]][coloring[v[0]]] >= a*t:
+                i = self._csr.index(v[0])
+                if self._interference_at(i, colors[i]) >= a*t:
                     v[1] += b
             # reordenamos los vertices de 'vertex_order' de mayor a menor acorde a su prioridad
             quickSortIterative(vertex_order, 0, len(vertex_order)-1)            
             iters+=1
-        return self.threshold(solution), solution
+        return best, self.labelled_coloring(solution)
     
-    def _coloring(self, vertex_order, spectrum):
+    def _coloring(self, vertex_order, spectrum, previous=None, semi_coloring=None):
         """Colorea a los vertices del grafo en el
-        orden dado de forma greedy.
+        orden dado de forma greedy. Si se da la coloracion
+        anterior y su orden, solo se colorean de nuevo los
+        vertices desde la primera posicion en que difieren
+        los ordenes.
 
         Args:
             vertex_order (list): Ordenacion de los vertices.
             spectrum (list): Espectro de colores.
+            previous (list, opcional): Orden de los vertices de la coloracion
+                anterior. Por defecto es None.
+            semi_coloring (dict, opcional): Coloracion anterior, que se modifica
+                y se corresponde con la memoria. Por defecto es None.
 
         Returns:
-            dict: Coloracion de los vertices del grafo.
+            dict, list: Coloracion de los vertices del grafo y su orden.
         """        
-        # inicializamos una coloracion y limpiamos la memoria        
-        semi_coloring = self._new_coloring()
+        order = [v[0] for v in vertex_order]
+        start = 0
+        if previous is None or semi_coloring is None:
+            # inicializamos una coloracion y limpiamos la memoria
+            semi_coloring = self._new_coloring()
+        else:
+            # buscamos el prefijo comun con el orden anterior
+            n_vertices = len(order)
+            while start < n_vertices and order[start] == previous[start]:
+                start += 1
+            # deshacemos la coloracion del resto de los vertices en orden
+            # inverso, los conteos enteros vuelven a los valores exactos
+            # que tenian al terminar de colorear el prefijo
+            for v in reversed(previous[start:]):
+                self._color_counts.unassign(self._csr.index(v))
+                semi_coloring[v] = None
         # coloreamos los vertices en el orden dado de forma greedy
         # minimizando la interferencia en cada paso y
         # actualizamos los valores de las memorias        
-        for v in vertex_order:
-            color = self._min_semi_interference(v[0], semi_coloring, spectrum)
-            semi_coloring[v[0]] = color
-            self._update_values(v[0], color, semi_coloring, True)
-        return semi_coloring
+        for v in order[start:]:
+            color = self._min_semi_interference(v, semi_coloring, spectrum)
+            semi_coloring[v] = color
+            self._update_values(v, color, semi_coloring, True)
+        return semi_coloring, order
 
 if __name__ == "__main__":
     
@@ -2,25 +2,34 @@
     Clase de Python para testear los resultados de TSC y CSC con diferentes algoritmos.
 """
 
-import random
 import numpy as np
-from code.graph2 import Graph
+from code.generators import gnp_random_graph
+from code.weight_functions import interference_matrix
 from stopwatch import Stopwatch
 
 
 class GraphTester(object):
 
-    def __init__(self, spectrum=None, w=None, extra_stats=False):
+    def __init__(self, spectrum=None, w=None, extra_stats=False, seed=None, cache=None):
         """Inicializa un objeto GaphTester.
 
         Args:
             spectrum (list): Espectro de colores. Por defecto es None.
-            w (dict): Matriz de interferencias entre los colores. Por defecto es None.
+            w (dict): Matriz de interferencias entre los colores, o un arreglo de
+                |S| x |S| en el orden del espectro. Por defecto es None.
             extra_stats (bool): Se usan mas estadisticas en caso de ser True. Por defecto es False.
+            seed (int): Semilla para generar los grafos aleatorios. Por defecto es None.
+            cache (ResultCache): Cache de resultados de TSC. Si se usa, cada experimento
+                recibe una semilla segun su numero de orden, por lo que al repetir los
+                experimentos los resultados se toman de la cache. Por defecto es None.
         """        
         self._w = w
         self._spectrum = spectrum
         self._extra_stats = extra_stats
+        self._rng = np.random.default_rng(seed)
+        self._cache = cache
+        # numero de experimentos ejecutados, se usa como semilla con la cache
+        self._trial = 0
 
     @property
     def w(self):
@@ -49,14 +58,12 @@ class GraphTester(object):
 
     def make_w(self, w_function):
         """Crea una matriz de interferencias entre los colores usando la funcion 'w_function'.
+        La matriz es el arreglo de solo lectura de 'interference_matrix', que se comparte
+        entre todos los experimentos con la misma funcion y tamaño del espectro.
         Args:
             w_function : Funcion de interferencia entre los colores.
         """        
-        new_w = {item:{} for item in self._spectrum}
-        for i, c1 in enumerate(self._spectrum):
-            for j, c2 in enumerate(self._spectrum):
-                new_w[c1][c2] = new_w[c2][c1] = w_function(i, j)
-        self._w = new_w
+        self._w = interference_matrix(w_function, len(self._spectrum))
 
     def _make_graph(self, n, p):
         """Crea un grafo aleatorio de 'n' vertices con una probabilidad
@@ -67,21 +74,9 @@ class GraphTester(object):
             p (float): Probabilidad de que dos vertices del grafo esten conectados.
 
         Returns:
-            Graph: Nuevo grafo.
+            CSRGraph: Nuevo grafo.
         """        
-        graph = np.zeros((n+1, n+1))
-        for i in range(1, n+1):
-            for j in range(i+1, n+1):
-                if random.random() <= p:
-                    graph[i,j] = graph[j, i] = 1
-        graph_dict = {}
-        for i in range(1, n+1):
-            neighbours_i = []
-            for j in range(1, n+1):
-                if graph[i,j]:
-                    neighbours_i.append(str(j))
-            graph_dict[str(i)] = neighbours_i
-        return Graph(graph_dict)
+        return gnp_random_graph(n, p, self._rng)
 
     def run_test2(self, graph, parameter, algorithm_class_dict, iters, log=True, all_solutions=False, TSC_OR_CSC='TSC', *args, **kargs):
         """Ejecuta los tests del problema 'TSC_OR_CSC' para el grafo dado usando los algoritmos de la lista.
@@ -92,7 +87,9 @@ class GraphTester(object):
             algorithm_class_dict (dict): Diccionario de algoritmos a usar.
             iters (int): Numero de veces que se ejecutaran las pruebas sobre el grafo.
             log (bool): Se imprimen los resultados mas relevantes en consola si es True. Por defecto es True.
-            all_solutions (bool): Agrega todas las soluciones obtenidas al diccionario devuelto si es True. Por defecto es False.
+            all_solutions (bool): Agrega todas las soluciones obtenidas al diccionario devuelto si es True.
+                Las coloraciones son arreglos compactos con el indice del color de cada vertice, en el
+                orden de 'graph.vertices()'. Por defecto es False.
             TSC_OR_CSC (str): Indica si se quiere resolver el problema TSC o CSC. Por defecto es 'TSC'.
 
         Returns:
@@ -209,10 +206,15 @@ class GraphTester(object):
         solution = {}
         times = {}
         timer = Stopwatch()
+        self._trial += 1
         for algorithm in algorithm_class_dict:
             algorithm_graph = algorithm_class_dict[algorithm](graph, self._spectrum, self._w)
+            if self._cache is not None:
+                algorithm_graph.set_cache(self._cache, self._trial)
             timer.restart()
-            if TSC_OR_CSC == 'TSC':
+            if TSC_OR_CSC == 'TSC' and self._cache is not None:
+                cost, coloring = algorithm_graph.CachedThresholdSpectrumColoring(parameter, *args, **kargs)
+            elif TSC_OR_CSC == 'TSC':
                 cost, coloring = algorithm_graph.ThresholdSpectrumColoring(parameter, *args, **kargs)
             elif TSC_OR_CSC == 'CSC':
                 cost, coloring = algorithm_graph.ChromaticSpectrumColoring(parameter, *args, **kargs)
@@ -220,7 +222,8 @@ class GraphTester(object):
                 return None
             timer.stop()
             times[algorithm] = timer.duration
-            solution[algorithm] = cost, coloring
+            # guardamos la coloracion como arreglo compacto con el indice del color de cada vertice
+            solution[algorithm] = cost, algorithm_graph.compact_coloring(coloring)
         return solution, times
 
     def _log(self, algorithm, statistics):
@@ -246,7 +249,8 @@ class GraphTester(object):
         Args:
             cost_list (list): Resultados de los problemas TSC o CSC para los experimentos.
             time_list (list): Tiempos de ejecucion de cada experimento.
-            solution_list (list): Coloracion obtenida en cada experimento.
+            solution_list (list): Coloracion obtenida en cada experimento, como arreglo compacto
+                con el indice del color de cada vertice.
             rank (int): Rank obtenido en los experimentos.
             nbest (int): Numero de veces que se obtuvo la mejor solucion es los experimentos.
 
@@ -272,7 +276,8 @@ class GraphTester(object):
                 if cost_list[i] < cost:
                     cost = cost_list[i]
                     bcoloring = solution_list[i]
-            stats['coloring'] = bcoloring
+            # la coloracion se guarda como lista para poder exportarla a JSON
+            stats['coloring'] = bcoloring.tolist() if bcoloring is not None else None
         return stats
 
     def _nbest_rank(self, solution_list):
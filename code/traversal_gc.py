@@ -0,0 +1,113 @@
+""" Python Class
+    Clase abstracta de Python para los metodos de coloracion
+    secuencial que recorren el grafo por componentes conexas,
+    comenzando cada componente por el vertice no visitado de
+    mayor grado y extrayendo los siguientes vertices de una
+    frontera. Las clases hijas solo definen como se agregan
+    y se extraen los vertices de la frontera.
+
+    El orden del recorrido solo depende del grafo, por lo que
+    se calcula trabajando con los indices del grafo en formato
+    CSR, un arreglo de vertices visitados y una lista de semillas
+    ordenada por grado que se calcula una sola vez.
+
+    Esta clase usa la implementacion de CSCBinarySearch
+    para resolver CSC mediante su implementacion de TSC.
+"""
+
+import random
+import numpy as np
+from code.secuencial_gc import SecuencialGraphColoring
+from code.csc_binarysearch import CSCBinarySearch
+
+
+class TraversalGraphColoring(SecuencialGraphColoring, CSCBinarySearch):
+
+    def _push(self, frontier, i):
+        """Agrega un vertice a la frontera del recorrido.
+
+        Args:
+            frontier (list): Frontera del recorrido.
+            i (int): Indice del vertice.
+        """
+        return None
+
+    def _pop(self, frontier):
+        """Extrae el siguiente vertice de la frontera del recorrido.
+
+        Args:
+            frontier (list): Frontera del recorrido.
+
+        Returns:
+            int: Indice del vertice.
+        """
+        return None
+
+    def _seed_order(self):
+        """Ordena los vertices por grado decreciente, con los empates en
+        un orden aleatorio. La semilla de cada componente conexa es el
+        primer vertice no visitado en este orden.
+
+        Returns:
+            list: Indices de los vertices.
+        """
+        degrees = np.diff(self._csr_graph().offsets)
+        keys = [random.random() for _ in range(degrees.shape[0])]
+        return np.lexsort((keys, -degrees)).tolist()
+
+    def _traversal_order(self):
+        """Recorre el grafo por componentes conexas usando la frontera de
+        la clase.
+
+        Returns:
+            list: Vertices del grafo en el orden del recorrido.
+        """
+        csr = self._csr_graph()
+        n = csr.n_vertices()
+        visit = bytearray(n)
+        order = []
+        for seed in self._seed_order():
+            if visit[seed]:
+                continue
+            # la semilla comienza una nueva componente conexa
+            visit[seed] = 1
+            frontier = []
+            self._push(frontier, seed)
+            while frontier:
+                i = self._pop(frontier)
+                order.append(i)
+                # agregamos cada vecino que no haya sido visitado
+                for u in csr.neighbour_indices(i).tolist():
+                    if not visit[u]:
+                        visit[u] = 1
+                        self._push(frontier, u)
+        return csr.labels[order].tolist()
+
+    def _sweep_order(self):
+        return self._traversal_order()
+
+    def ThresholdSpectrumColoring(self, k):
+        """Determina el minimo umbral k-cromatico de TSC
+        coloreando los vertices en el orden del recorrido.
+
+        Args:
+            k (int): Numero de colores permitidos.
+
+        Returns:
+            float, dict: Minimo umbral k-cromatico, coloracion
+                del grafo que cumple las restricciones.
+        """
+        # inicializamos una coloracion y limpiamos la memoria
+        semi_coloring = self._new_coloring()
+        # reducimos el numero de colores del espectro a k
+        spectrum = self._spectrum[:k]
+        for vertex in self._traversal_order():
+            self._vertex_order.append(vertex)
+            # tomamos el color con la menor potencial interferencia para el vertice
+            color = self._min_semi_interference(vertex, semi_coloring, spectrum)
+            # asignamos el color al vertice
+            semi_coloring[vertex] = color
+            # actualizamos los valores de las memorias
+            self._update_values(vertex, color, semi_coloring)
+        # evaluamos la coloracion con el arreglo de colores de la memoria
+        return self.threshold(self._vertex_color), semi_coloring
@@ -11,6 +11,7 @@
     para resolver CSC mediante su implementacion de TSC.
 """
 
+import numpy as np
 from code.graph2 import Graph
 from code.secuencial_gc import SecuencialGraphColoring
 from code.csc_binarysearch import CSCBinarySearch
@@ -18,28 +19,69 @@ from code.csc_binarysearch import CSCBinarySearch
 
 class VertexMergeGraphColoring(SecuencialGraphColoring, CSCBinarySearch):
         
-    def _max_vdegree_with_sdegree(self, semi_coloring, tabu_list=[]):
-        """Determina el vertice con mayor grado que no este coloreado ni
-        pertenezca la lista de tabues.
+    def _take(self, position):
+        """Elimina una posicion del orden de la lista de candidatos.
 
         Args:
-            semi_coloring (dict): Coloracion parcial de los vertices del grafo.
-            tabu_list (list): Lista de vertices a ignorar por el metodo. Por
-                defecto es vacia ([]).
+            position (int): Posicion del vertice en el orden por grado.
+        """
+        self._next[self._prev[position]] = self._next[position]
+        self._prev[self._next[position]] = self._prev[position]
+
+    def _max_vdegree_with_sdegree(self, tabu_list=None):
+        """Determina el vertice con mayor grado que no haya sido tomado ni
+        pertenezca la lista de tabues, y lo elimina de la lista de
+        candidatos. Los candidatos se recorren en orden de grado, por lo
+        que solo se visitan los vertices de la lista de tabues que lo
+        preceden.
+
+        Args:
+            tabu_list (set): Indices de los vertices a ignorar por el metodo.
+                Por defecto es None.
 
         Returns:
-            Vertice con mayor grado.
-        """        
-        best_v = None
-        for v in self.vertices():
-            # comprobamos que el vertice no este coloreado y no pertenezca
-            # a tabu_list
-            if not semi_coloring[v] and not v in tabu_list:
-                if not best_v:
-                    best_v = v
-                if self._vertex_degree[v] > self._vertex_degree[best_v]:
-                    best_v = v
-        return best_v
+            int: Indice del vertice con mayor grado, o None si no existe.
+        """
+        n = len(self._degree_order)
+        position = self._next[n]
+        while position != n and tabu_list and self._degree_order[position] in tabu_list:
+            position = self._next[position]
+        if position == n:
+            return None
+        self._take(position)
+        return self._degree_order[position]
+
+    def _merge_order(self):
+        """Determina el orden en que se colorean los vertices: en cada paso
+        se toma el vertice de mayor grado y el siguiente de mayor grado no
+        adyacente a el. Este orden no depende de los colores asignados.
+
+        Returns:
+            list: Vertices del grafo en el orden de coloracion.
+        """
+        csr = self._csr_graph()
+        # orden estable por grado decreciente, en caso de empate se respeta
+        # el orden de los vertices del grafo
+        self._degree_order = np.argsort(-np.diff(csr.offsets), kind='stable').tolist()
+        n = len(self._degree_order)
+        # lista doblemente enlazada de las posiciones no tomadas del orden,
+        # la posicion n es el centinela de inicio y fin
+        self._next = list(range(1, n + 1)) + [0]
+        self._prev = [n] + list(range(n))
+        order = []
+        while len(order) < n:
+            # tomamos el vertice con mayor grado entre los no visitados
+            i = self._max_vdegree_with_sdegree()
+            order.append(i)
+            # tomamos el vertice de mayor grado no adyacente al que seleccionamos
+            # anteriormente, en caso de que exista
+            fneighbour = self._max_vdegree_with_sdegree(set(csr.neighbour_indices(i).tolist()))
+            if fneighbour is not None:
+                order.append(fneighbour)
+        return csr.labels[order].tolist()
+
+    def _sweep_order(self):
+        return self._merge_order()
 
     def ThresholdSpectrumColoring(self, k):
         """Determina el minimo umbral k-cromatico de TSC
@@ -57,30 +99,16 @@ class VertexMergeGraphColoring(SecuencialGraphColoring, CSCBinarySearch):
         semi_coloring = self._new_coloring()
         # reducimos el numero de colores del espectro a k
         spectrum = self._spectrum[:k]
-        # vertices = self.vertices()
-        n_colored = 0
-        n_vertices = len(self.vertices())
-        while n_colored < n_vertices:
-            # tomamos el vertices con mayor grado entre los no visitados
-            vertex = self._max_vdegree_with_sdegree(semi_coloring)
+        for vertex in self._merge_order():
             self._vertex_order.append(vertex)
             # tomamos el color con la menor potencial interferencia para el vertice            
             color = self._min_semi_interference(vertex, semi_coloring, spectrum)
             # asignamos el color al vertice
             semi_coloring[vertex] = color
-            n_colored+=1
             # actualizamos los valores de las memorias
             self._update_values(vertex, color, semi_coloring)
-            # tomamos el vertice de mayor grado no adyacente al que seleccionamos
-            # anteriormente, y en caso de que exista, repetimos el mismo proceso
-            fneighbour = self._max_vdegree_with_sdegree(semi_coloring, self._graph.neighbours(vertex))
-            if fneighbour is not None:
-                self._vertex_order.append(fneighbour)
-                color = self._min_semi_interference(fneighbour, semi_coloring, spectrum)
-                semi_coloring[fneighbour] = color
-                n_colored+=1 
-                self._update_values(fneighbour, color, semi_coloring)
-        return self.threshold(semi_coloring), semi_coloring
+        # evaluamos la coloracion con el arreglo de colores de la memoria
+        return self.threshold(self._vertex_color), semi_coloring
 
     
 if __name__ == "__main__":
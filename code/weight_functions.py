@@ -1,43 +1,78 @@
-""" Funciones de peso usadas para generar 
+""" Funciones de peso usadas para generar
     la matriz de interfencia entre los colores.
+
+    Las funciones se comportan como ufuncs de NumPy: reciben colores
+    o arreglos de colores y se evaluan elemento a elemento, por lo que
+    la matriz completa se calcula de una vez sobre la rejilla de indices.
+    Las matrices ya calculadas se guardan por funcion y tamaño del
+    espectro, y se comparten como arreglos de solo lectura.
 """
 
+import numpy as np
+
+# interferencia de la funcion empirica para cada distancia entre colores,
+# la ultima posicion es la de las distancias mayores o iguales que 6
+_EMPIRIC_VALUES = np.array([1, 0.8, 0.5, 0.2, 0.1, 0.001, 0])
+
+# matrices de interferencias calculadas, por funcion y tamaño del espectro
+_W_CACHE = {}
+
+
 def inv_pow2(x, y):
     """ Funcion de decrecimiento exponencial de base 2 para
     la interferencia entre dos colores del espectro.
 
     Args:
-        x : Color 1.
-        y : Color 2.
+        x : Color 1, o arreglo de colores.
+        y : Color 2, o arreglo de colores.
 
     Returns:
         float: Interferencia entre ambos colores.
-    """    
-    return 1/2**abs(x-y)
+    """
+    return np.power(2.0, -np.abs(np.subtract(x, y)))
 
 def empiric_dist(x, y):
     """ Funcion de valores empiricos para la interferencia
     entre dos colores del espectro.
 
     Args:
-        x : Color 1.
-        y : Color 2.
+        x : Color 1, o arreglo de colores.
+        y : Color 2, o arreglo de colores.
 
     Returns:
         float: Interferencia entre ambos colores.
-    """   
-    dif = abs(x-y)
-    if dif is 0:
-        return 1
-    elif dif is 1:
-        return 0.8
-    elif dif is 2:
-        return 0.5
-    elif dif is 3:
-        return 0.2
-    elif dif is 4:
-        return 0.1
-    elif dif is 5:
-        return 0.001
-    elif dif >= 6:
-        return 0
\ No newline at end of file
+    """
+    dif = np.abs(np.subtract(x, y))
+    return _EMPIRIC_VALUES[np.minimum(dif, _EMPIRIC_VALUES.shape[0] - 1)]
+
+def interference_matrix(w_function, size):
+    """ Matriz de interferencias de un espectro de 'size' colores. La
+    funcion se evalua sobre toda la rejilla de indices de una vez, y si
+    no admite arreglos se evalua elemento a elemento. Como en 'make_w',
+    la celda (i, j) con i < j toma el valor de w_function(j, i). El
+    resultado se guarda y se devuelve el mismo arreglo, de solo lectura,
+    en las siguientes llamadas con la misma funcion y tamaño.
+
+    Args:
+        w_function : Funcion de interferencia entre los colores.
+        size (int): Cantidad de colores del espectro.
+
+    Returns:
+        array: Matriz de size x size de interferencias.
+    """
+    key = (w_function, size)
+    if key in _W_CACHE:
+        return _W_CACHE[key]
+    rows = np.arange(size).reshape(size, 1)
+    cols = np.arange(size).reshape(1, size)
+    try:
+        values = np.asarray(w_function(rows, cols), dtype=np.float64)
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.shape != (size, size):
+        values = np.frompyfunc(w_function, 2, 1)(rows, cols).astype(np.float64)
+    # la matriz es simetrica, tomamos el triangulo inferior
+    w = np.where(rows >= cols, values, values.T)
+    w.setflags(write=False)
+    _W_CACHE[key] = w
+    return w
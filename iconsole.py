@@ -17,7 +17,7 @@ from code.degree_bfs import DegreeBFSGraphColoring
 from code.swo import SWOGraphColoring
 from code.improved_methods import DSATURPlusSS, VMPlusSS, \
     BFSPlusSS, DBFSPlusSS, SWOPlusSS
-from code.dimacs import dimacs_reader
+from code.graph_cache import cached_dimacs_reader
 from tests import tsc_test, csc_test, tsc_test_for_random_graph, csc_test_for_random_graph
 
 
@@ -200,12 +200,12 @@ while True:
         if RANDOM_OR_DIMACS == 'RANDOM':
             result = tsc_test_for_random_graph(algorithms, n_vertices, p, s_size, n_graph, iters, k, w_function=matrix)
         elif RANDOM_OR_DIMACS == 'DIMACS':
-            result = tsc_test(algorithms, dimacs_reader(dimacs_path), s_size, iters, k, w_function=matrix)
+            result = tsc_test(algorithms, cached_dimacs_reader(dimacs_path), s_size, iters, k, w_function=matrix)
     elif TSC_OR_CSC == 'CSC':
         if RANDOM_OR_DIMACS == 'RANDOM':
             result = csc_test_for_random_graph(algorithms, n_vertices, p, n_graph, iters, t, w_function=matrix)
         elif RANDOM_OR_DIMACS == 'DIMACS':
-            result = csc_test(algorithms, dimacs_reader(dimacs_path), iters, t, w_function=matrix)
+            result = csc_test(algorithms, cached_dimacs_reader(dimacs_path), iters, t, w_function=matrix)
     if save_file is True:
         with open('{}.json'.format(file_name), 'w') as handle:
             handle.write(json.dumps(result))
@@ -16,7 +16,8 @@ from code.improved_methods import DSATURPlusSS, VMPlusSS, \
     BFSPlusSS, DBFSPlusSS, SWOPlusSS
 from code.tester import GraphTester
 from code.weight_functions import inv_pow2, empiric_dist
-from code.dimacs import dimacs_reader
+from code.graph_cache import cached_dimacs_reader
+from code.generators import geometric_graph
 
 
 # Algoritmos usados en los experimentos
@@ -261,13 +262,25 @@ def test_for_hd_graph(save_file=True):
         with open('test_for_real_case_hd.json', 'w') as handle:
             handle.write(json.dumps(statistics))
 
+# Caso de una red inalambrica generada a partir de la posicion de sus transmisores
+def test_for_wireless_graph(n_vertices, radius, distribution='uniform', save_file=True):
+    print("_________________________________")
+    print("---------------------------------")
+    print('Test for {} wireless graph with TSC'.format(distribution))
+    graph = geometric_graph(n_vertices, radius, distribution=distribution)
+    global algorithms
+    statistics = tsc_test(algorithms, graph, 11, 100, 11)
+    if save_file is True:
+        with open('test_for_wireless_{}_{}.json'.format(distribution, n_vertices), 'w') as handle:
+            handle.write(json.dumps(statistics))
+
 # Test para grafo en representacio DIMACS
 def test_for_dimacs_graph(graph_path, save_file=True):
     case_name = graph_path.split('/')[-1]
     print("_________________________________")
     print("---------------------------------")
     print('Test for {} graph with TSC'.format(case_name))
-    graph = dimacs_reader(graph_path)
+    graph = cached_dimacs_reader(graph_path)
     global algorithms
     statistics = tsc_test(algorithms, graph, 11, 100, 11)
     if save_file is True:
@@ -305,6 +318,7 @@ if __name__ == "__main__":
 
     # test_for_ld_graph() # test for a real low-density graph
     # test_for_hd_graph() # test for a real high-density graph
+    # test_for_wireless_graph(1000, 0.05) # test for a generated wireless graph
 
     ##############################################
     ## Tests for DIMACS graphs